@@ -0,0 +1,91 @@
+import time
+from collections import Counter, deque
+
+from constants import PlayerType, GRID_WIDTH, AI_DEPTH
+from evaluator import Evaluator
+from search import SearchEngine
+from engine import Action
+
+# Nombre de coups récents gardés dans l'historique des temps de réflexion
+THINK_HISTORY = 200
+
+class TetrisAI:
+    """Recherche heuristique du meilleur coup, indépendante de l'interface"""
+
+    def __init__(self, depth=AI_DEPTH, beam_width=None, vectorized=False, preview=1, workers=1, time_budget=None,
+                 evaluator=None):
+        # Notation des poses, commune à tous les niveaux et à toutes les recherches
+        self.evaluator = evaluator or Evaluator()
+
+        # Recherche sur `depth` pièces, en gardant les `beam_width` meilleures poses par niveau,
+        # les coups de la racine étant répartis sur `workers` processus ; avec `time_budget` (ms),
+        # la recherche s'approfondit tant qu'il reste du temps ; avec `vectorized`, le dernier
+        # niveau est noté en lots NumPy (ignoré si NumPy est absent)
+        self.search = SearchEngine(depth=depth, beam_width=beam_width, workers=workers, time_budget=time_budget,
+                                   evaluator=self.evaluator, vectorized=vectorized)
+
+        # Nombre de pièces à venir connues de l'IA (1 : la pièce suivante affichée)
+        self.preview = preview
+
+        # Derniers coups calculés : (temps de réflexion en ms, poses évaluées, profondeur atteinte)
+        self.think_times = deque(maxlen=THINK_HISTORY)
+
+        # Nombre de coups calculés par profondeur atteinte, depuis la dernière remise à zéro
+        self.depth_counts = Counter()
+
+    def choose_move(self, engine, player_type=PlayerType.AI):
+        """Calcule le meilleur coup pour la pièce actuelle d'un joueur du moteur"""
+        return self.choose_move_from(self.snapshot(engine, player_type))
+
+    def snapshot(self, engine, player_type=PlayerType.AI):
+        """Copie de tout ce dont la recherche a besoin, utilisable hors du thread du jeu"""
+        player = engine.players[player_type]
+        return {
+            'rows': player.board.rows[:],
+            'piece_types': (player.current_piece.type,) + tuple(engine.preview(player_type, self.preview)),
+            'features': player.features.copy(),
+            'hash': player.board.hash,
+        }
+
+    def choose_move_from(self, position):
+        """Calcule le meilleur coup à partir d'une copie obtenue par `snapshot`"""
+        rows, piece_types, features = position['rows'], position['piece_types'], position['features']
+        started = time.perf_counter()
+        best_move = self.search.best_move(rows, piece_types, features, position['hash'])
+        think_time = (time.perf_counter() - started) * 1000
+        depth = (best_move or {}).get('depth', 0)
+        self.think_times.append((think_time, (best_move or {}).get('nodes', 0), depth))
+        self.depth_counts[depth] += 1
+
+        # Vérifier que best_move est correctement défini
+        if not best_move or 'rotation' not in best_move or 'column' not in best_move:
+            # Valeurs par défaut sûres
+            best_move = {'rotation': 0, 'column': GRID_WIDTH // 2 - 1}
+            print("Utilisation de valeurs par défaut pour l'IA")
+
+        return best_move
+
+    def depth_summary(self):
+        """Profondeur moyenne et minimale atteinte sur les coups comptés dans `depth_counts`"""
+        moves = sum(self.depth_counts.values())
+        if not moves:
+            return {'mean': None, 'min': None}
+        total = sum(depth * count for depth, count in self.depth_counts.items())
+        return {'mean': total / moves, 'min': min(self.depth_counts)}
+
+    def play_turn(self, engine, player_type=PlayerType.AI):
+        """Joue un coup complet sans interface : rotation, déplacement puis chute"""
+        best_move = self.choose_move(engine, player_type)
+        for action in move_actions(engine, player_type, best_move):
+            engine.step(player_type, action)
+        return engine.step(player_type, Action.DROP)
+
+def move_actions(engine, player_type, move):
+    """Actions (rotations puis déplacements) amenant la pièce sur le coup choisi"""
+    player = engine.players[player_type]
+    rotation_count = player.current_piece.shape.count
+    actions = [Action.ROTATE] * ((move['rotation'] - player.rotation) % rotation_count)
+
+    delta = move['column'] - player.position[1]
+    actions += [Action.RIGHT if delta > 0 else Action.LEFT] * abs(delta)
+    return actions
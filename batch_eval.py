@@ -0,0 +1,100 @@
+"""Évaluation vectorisée des coups de l'IA avec NumPy (optionnelle).
+
+Au dernier niveau de `SearchEngine` (vectorized=True), toutes les grilles
+filles d'un nœud sont empilées dans un tableau (N, GRID_HEIGHT, GRID_WIDTH)
+et toutes les poses de la pièce suivante, sur toutes les colonnes, y sont
+notées d'un coup. Les caractéristiques sont celles de
+`BoardFeatures.placement` (lignes complètes non effacées) et les scores sont
+calculés avec les poids de l'évaluateur, dans le même ordre d'opérations que
+`Evaluator.score` : la recherche choisit exactement les mêmes coups qu'en
+Python pur.
+"""
+from constants import GRID_WIDTH, GRID_HEIGHT
+from evaluator import WELL_MIN_HEIGHT
+from shapes import SHAPE_REGISTRY
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel
+    np = None
+
+def numpy_available():
+    """Vrai si NumPy est installé"""
+    return np is not None
+
+def rows_to_boards(rows_list):
+    """Convertit des listes de masques de lignes en tableau booléen (N, GRID_HEIGHT, GRID_WIDTH)"""
+    bits = np.array(rows_list, dtype=np.int64)[:, :, None] >> np.arange(GRID_WIDTH)
+    return (bits & 1).astype(bool)
+
+def placements(piece_type):
+    """Toutes les poses (rotation, colonne) dans l'ordre de `SearchEngine.candidates`"""
+    return [(rotation, column)
+            for rotation, shape in enumerate(SHAPE_REGISTRY[piece_type].rotations)
+            for column in shape.positions]
+
+def landing_rows(heights, piece_type, moves):
+    """Lignes d'arrivée (M, N) de M coups sur N grilles de hauteurs (N, GRID_WIDTH)"""
+    landing = np.full((len(moves), heights.shape[0]), GRID_HEIGHT, dtype=np.int64)
+    for m, (rotation, column) in enumerate(moves):
+        for y, bottom in SHAPE_REGISTRY[piece_type].rotations[rotation].skirt:
+            np.minimum(landing[m], GRID_HEIGHT - heights[:, column + y] - 1 - bottom, out=landing[m])
+    return landing
+
+def drop_pieces(boards, piece_type, moves, landing):
+    """Grilles (M, N, H, W) après la pose de chaque coup sur chaque grille ; les coups impossibles restent vides"""
+    dropped = np.repeat(boards[None], len(moves), axis=0)
+    valid = landing >= 0
+    for m, (rotation, column) in enumerate(moves):
+        targets = np.nonzero(valid[m])[0]
+        rows = landing[m, targets]
+        for x, y in SHAPE_REGISTRY[piece_type].rotations[rotation].cells:
+            dropped[m, targets, rows + x, column + y] = True
+    return dropped, valid
+
+def column_heights(boards):
+    """Hauteur de chaque colonne de chaque grille (N, GRID_WIDTH)"""
+    filled = boards.any(axis=1)
+    first = boards.argmax(axis=1)
+    return np.where(filled, GRID_HEIGHT - first, 0)
+
+def board_features(boards):
+    """Caractéristiques nommées (voir `evaluator.FEATURES`) de chaque grille (N,) après pose"""
+    heights = column_heights(boards)
+    covered = np.logical_or.accumulate(boards, axis=1)
+    middle = heights[:, 1:-1]
+    return {
+        'lines_cleared': boards.all(axis=2).sum(axis=1),
+        'height_sum': heights.sum(axis=1),
+        'holes': (covered & ~boards).sum(axis=(1, 2)),
+        'transitions': (boards[:, 1:, :] != boards[:, :-1, :]).sum(axis=(1, 2)),
+        'bumpiness': np.abs(np.diff(heights, axis=1)).sum(axis=1),
+        'max_height': heights.max(axis=1),
+        'wells': ((middle < heights[:, :-2] - 3) & (middle < heights[:, 2:] - 3)).sum(axis=1),
+    }
+
+def evaluate_boards(boards, piece_type, evaluator):
+    """Score de `Evaluator.score` pour chaque grille (N,) après pose"""
+    features = board_features(boards)
+
+    score = np.zeros(len(boards))
+    for name, weight in evaluator.terms:
+        score += features[name] * weight
+
+    if evaluator.well_weight and piece_type != 'I':
+        score += np.where(features['max_height'] > WELL_MIN_HEIGHT, features['wells'] * evaluator.well_weight, 0)
+
+    return score
+
+def best_scores(boards, piece_type, evaluator):
+    """Meilleur score d'une pose de la pièce sur chaque grille (N,), et nombre de poses possibles.
+
+    Une grille où la pièce ne rentre nulle part vaut -inf, comme une recherche
+    sans candidat.
+    """
+    moves = placements(piece_type)
+    landing = landing_rows(column_heights(boards), piece_type, moves)
+    dropped, valid = drop_pieces(boards, piece_type, moves, landing)
+    scores = evaluate_boards(dropped.reshape(-1, GRID_HEIGHT, GRID_WIDTH), piece_type, evaluator)
+    scores = np.where(valid.reshape(-1), scores, float('-inf')).reshape(len(moves), len(boards))
+    return scores.max(axis=0), int(valid.sum())
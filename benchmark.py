@@ -0,0 +1,240 @@
+"""Mesures de performance de l'IA et des opérations de base du jeu.
+
+Exemple : python benchmark.py --output bench.json --compare ancien.json
+
+Chaque opération est chronométrée appel par appel sur une bibliothèque fixe
+de grilles (vide, milieu de partie, haute et trouée, proche de la fin). Les
+résultats (percentiles de latence en microsecondes, opérations par seconde)
+sont enregistrés en JSON pour comparer deux versions.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import batch_eval
+from board import Board, FULL_ROW, board_hash, fits, landing_row
+from constants import GRID_WIDTH, GRID_HEIGHT, STANDARD_SHAPES, AI_DEPTH
+from features import BoardFeatures
+from search import SearchEngine
+from shapes import SHAPE_REGISTRY
+
+# Pièces (actuelle, suivante) utilisées pour chaque mesure
+PIECE_PAIRS = [('T', 'I'), ('S', 'Z'), ('L', 'O'), ('I', 'J')]
+
+def make_rows(rng, height, hole_rate):
+    """Grille aléatoire de `height` lignes remplies, avec environ `hole_rate` de cases vides"""
+    rows = [0] * GRID_HEIGHT
+    for row in range(GRID_HEIGHT - height, GRID_HEIGHT):
+        mask = 0
+        for col in range(GRID_WIDTH):
+            if rng.random() >= hole_rate:
+                mask |= 1 << col
+        # Jamais de ligne complète : elle aurait déjà été effacée
+        if mask == FULL_ROW:
+            mask &= ~(1 << rng.randrange(GRID_WIDTH))
+        rows[row] = mask
+    return rows
+
+def build_positions(seed=2024):
+    """Bibliothèque fixe de grilles, identique d'une exécution à l'autre"""
+    rng = random.Random(seed)
+    return {
+        'empty': [0] * GRID_HEIGHT,
+        'mid_game': make_rows(rng, 6, 0.25),
+        'tall_holey': make_rows(rng, 13, 0.4),
+        'near_death': make_rows(rng, 17, 0.2),
+    }
+
+def board_from_rows(rows):
+    """Grille complète (masques, cases et hachage) à partir de masques de lignes"""
+    board = Board()
+    board.rows = list(rows)
+    board.cells = [[rows[row] >> col & 1 for col in range(GRID_WIDTH)] for row in range(GRID_HEIGHT)]
+    board.hash = board_hash(rows)
+    return board
+
+def percentile(samples, fraction):
+    """Percentile d'une liste de mesures déjà triée"""
+    index = min(len(samples) - 1, int(fraction * len(samples)))
+    return samples[index]
+
+def summarize(samples_ns, moves=None):
+    """Statistiques d'une opération : percentiles (µs) et débit"""
+    samples = sorted(ns / 1000 for ns in samples_ns)
+    total = sum(samples)
+    summary = {
+        'calls': len(samples),
+        'mean_us': total / len(samples),
+        'p50_us': percentile(samples, 0.50),
+        'p90_us': percentile(samples, 0.90),
+        'p99_us': percentile(samples, 0.99),
+        'max_us': samples[-1],
+        'ops_per_s': len(samples) / total * 1e6 if total else 0.0,
+    }
+    if moves is not None:
+        summary['moves_per_s'] = summary['ops_per_s']
+    return summary
+
+def timed(samples, func, *args):
+    """Appelle func(*args) en ajoutant sa durée (ns) aux mesures"""
+    start = time.perf_counter_ns()
+    func(*args)
+    samples.append(time.perf_counter_ns() - start)
+
+def bench_search(rows, repeat, depth, vectorized=False):
+    """Recherche du moteur (`SearchEngine.best_move`), caches vidés avant chaque appel"""
+    if vectorized and not batch_eval.numpy_available():
+        return {'skipped': "NumPy absent"}
+    features = BoardFeatures(rows)
+    zhash = board_hash(rows)
+    samples = []
+    for _ in range(repeat):
+        for current, following in PIECE_PAIRS:
+            search = SearchEngine(depth=depth, vectorized=vectorized)
+            timed(samples, search.best_move, rows, (current, following), features, zhash)
+    return summarize(samples, moves=True)
+
+def bench_evaluate(rows, repeat):
+    """Évaluation d'une pose (`SearchEngine.evaluate`) pour toutes les rotations et colonnes jouables"""
+    search = SearchEngine()
+    features = BoardFeatures(rows)
+    samples = []
+    for _ in range(repeat):
+        for piece_type in STANDARD_SHAPES:
+            for shape in SHAPE_REGISTRY[piece_type].rotations:
+                for column in shape.positions:
+                    timed(samples, search.evaluate, rows, features, piece_type, shape, column)
+    return summarize(samples)
+
+def bench_is_valid(rows, repeat):
+    """Test de collision (`fits`) à la ligne d'arrivée de chaque pose"""
+    heights = BoardFeatures(rows).heights
+    cases = []
+    for piece_type in STANDARD_SHAPES:
+        for shape in SHAPE_REGISTRY[piece_type].rotations:
+            for column in range(GRID_WIDTH):
+                row = landing_row(heights, shape, column)
+                cases.append((shape, (max(row, 0), column)))
+
+    samples = []
+    for _ in range(repeat):
+        for shape, position in cases:
+            timed(samples, fits, rows, shape, position)
+    return summarize(samples)
+
+def bench_clear_lines(rows, repeat):
+    """Effacement de lignes (`Board.clear_rows`) après avoir complété les 1 à 4 lignes du bas"""
+    samples = []
+    for _ in range(repeat):
+        for count in range(1, 5):
+            filled = list(rows)
+            for row in range(GRID_HEIGHT - count, GRID_HEIGHT):
+                filled[row] = FULL_ROW
+            board = board_from_rows(filled)
+            timed(samples, board.clear_rows, board.full_rows())
+    return summarize(samples)
+
+def bench_render(rows, repeat):
+    """Affichage complet d'une grille (`BoardRenderer.render`), ignoré si Tk n'a pas d'écran"""
+    try:
+        import tkinter as tk
+    except ImportError as e:
+        return {'skipped': f"{type(e).__name__}: {e}"}
+    from engine import TetrisEngine
+    from renderer import BoardRenderer
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        # Sans écran, Tk ne peut pas créer de fenêtre : la mesure est signalée comme ignorée
+        return {'skipped': f"{type(e).__name__}: {e}"}
+    try:
+        canvas = tk.Canvas(root, width=GRID_WIDTH * 30, height=GRID_HEIGHT * 30)
+        renderer = BoardRenderer(canvas, 30, ['#FF0000'])
+        engine = TetrisEngine(seed=0)
+        engine.start()
+        player = next(iter(engine.players.values()))
+        player.board = board_from_rows(rows)
+
+        samples = []
+        for _ in range(repeat):
+            # Redessin complet, puis redessin d'un simple déplacement de la pièce
+            player.changes.full = True
+            timed(samples, renderer.render, player)
+            player.changes.mark_piece(player.current_piece.type, player.rotation, player.position)
+            timed(samples, renderer.render, player)
+            root.update_idletasks()
+        return summarize(samples)
+    finally:
+        root.destroy()
+
+def run(repeat=20, depth=AI_DEPTH, render=True):
+    """Lance toutes les mesures sur toutes les grilles de la bibliothèque"""
+    operations = {
+        'search': lambda rows: bench_search(rows, repeat, depth),
+        'search_vectorized': lambda rows: bench_search(rows, repeat, depth, vectorized=True),
+        'evaluate': lambda rows: bench_evaluate(rows, repeat),
+        'is_valid_position': lambda rows: bench_is_valid(rows, repeat),
+        'clear_lines': lambda rows: bench_clear_lines(rows, repeat * 10),
+    }
+    if render:
+        operations['render'] = lambda rows: bench_render(rows, repeat)
+
+    results = {}
+    for name, rows in build_positions().items():
+        results[name] = {}
+        for operation, bench in operations.items():
+            results[name][operation] = bench(rows)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'depth': depth,
+        'positions': results,
+    }
+
+def compare(current, baseline, output=sys.stdout):
+    """Affiche le rapport des latences médianes entre deux exécutions (>1 : plus lent)"""
+    for name, operations in current['positions'].items():
+        for operation, summary in operations.items():
+            old = baseline.get('positions', {}).get(name, {}).get(operation, {})
+            if 'p50_us' in summary and old.get('p50_us'):
+                ratio = summary['p50_us'] / old['p50_us']
+                output.write(f"{name:12} {operation:18} {old['p50_us']:10.1f} -> {summary['p50_us']:10.1f} µs  x{ratio:.2f}\n")
+
+def report(results, output=sys.stdout):
+    """Affiche un tableau des latences par grille et par opération"""
+    for name, operations in results['positions'].items():
+        for operation, summary in operations.items():
+            if 'skipped' in summary:
+                output.write(f"{name:12} {operation:18} ignoré ({summary['skipped']})\n")
+                continue
+            output.write(f"{name:12} {operation:18} p50 {summary['p50_us']:10.1f} µs  p99 {summary['p99_us']:10.1f} µs"
+                         f"  {summary['ops_per_s']:12.0f} op/s\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance de l'IA et du jeu")
+    parser.add_argument('--repeat', type=int, default=20, help="nombre de répétitions par grille")
+    parser.add_argument('--depth', type=int, default=AI_DEPTH, help="profondeur de la recherche mesurée")
+    parser.add_argument('--no-render', action='store_true', help="ne pas mesurer l'affichage Tk")
+    parser.add_argument('--output', help="fichier JSON où enregistrer les résultats")
+    parser.add_argument('--compare', help="fichier JSON d'une exécution précédente à comparer")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.depth, render=not args.no_render)
+    report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
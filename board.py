@@ -0,0 +1,221 @@
+import random
+
+from constants import GRID_WIDTH, GRID_HEIGHT
+
+# Masque d'une ligne complète (un bit par colonne, bit 0 = colonne 0)
+FULL_ROW = (1 << GRID_WIDTH) - 1
+
+# Nombre de bits à 1 pour chaque masque de ligne possible
+POPCOUNT = [bin(mask).count('1') for mask in range(FULL_ROW + 1)]
+
+def _zobrist_table():
+    """Clés de Zobrist par ligne : table[ligne][masque] = XOR des clés des cases du masque"""
+    # Graine fixe : les hachages sont identiques d'un processus à l'autre
+    rng = random.Random(0x7E7215)
+    table = []
+    for _ in range(GRID_HEIGHT):
+        cell_keys = [rng.getrandbits(64) for _ in range(GRID_WIDTH)]
+        row_keys = [0] * (FULL_ROW + 1)
+        for mask in range(1, FULL_ROW + 1):
+            lowest = mask & -mask
+            row_keys[mask] = row_keys[mask ^ lowest] ^ cell_keys[lowest.bit_length() - 1]
+        table.append(row_keys)
+    return table
+
+ZOBRIST = _zobrist_table()
+
+def board_hash(rows):
+    """Hachage de Zobrist d'une grille (XOR des clés de ses cases occupées)"""
+    zhash = 0
+    for row in range(GRID_HEIGHT):
+        zhash ^= ZOBRIST[row][rows[row]]
+    return zhash
+
+def cleared_hash(rows, lowest):
+    """Clés de Zobrist des lignes jusqu'à la ligne `lowest` incluse.
+
+    Seules les lignes jusqu'à la plus basse effacée changent de masque : un
+    effacement retire leurs clés du hachage avant de tasser la grille, puis
+    ajoute leurs nouvelles clés après.
+    """
+    zhash = 0
+    for row in range(lowest + 1):
+        zhash ^= ZOBRIST[row][rows[row]]
+    return zhash
+
+class Board:
+    """Grille stockée sous forme d'un masque de 10 bits par ligne.
+
+    Les masques servent aux tests de collision et aux lignes complètes ; la
+    grille `cells` garde à côté la valeur de chaque case (1 ou type de pièce
+    spéciale) pour l'affichage.
+    """
+    def __init__(self):
+        self.rows = [0] * GRID_HEIGHT
+        self.cells = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+
+        # Hachage de Zobrist tenu à jour à chaque pose et effacement
+        self.hash = 0
+
+    def copy(self):
+        """Copie indépendante de la grille"""
+        board = Board.__new__(Board)
+        board.rows = self.rows[:]
+        board.cells = [row[:] for row in self.cells]
+        board.hash = self.hash
+        return board
+
+    def is_valid(self, shape, position):
+        """Vérifie si une rotation de pièce (`shapes.Rotation`) tient à une position donnée"""
+        return fits(self.rows, shape, position)
+
+    def place(self, shape, position, value=1):
+        """Pose une rotation de pièce (`shapes.Rotation`) sur la grille"""
+        row, column = position
+        for x, y in shape.cells:
+            grid_x = row + x
+            grid_y = column + y
+            if 0 <= grid_x < GRID_HEIGHT and 0 <= grid_y < GRID_WIDTH:
+                mask = self.rows[grid_x]
+                self.rows[grid_x] = mask | 1 << grid_y
+                self.hash ^= ZOBRIST[grid_x][mask] ^ ZOBRIST[grid_x][self.rows[grid_x]]
+                self.cells[grid_x][grid_y] = value
+
+    def full_rows(self):
+        """Indices des lignes complètes, du haut vers le bas"""
+        return [row for row in range(GRID_HEIGHT) if self.rows[row] == FULL_ROW]
+
+    def clear_rows(self, rows):
+        """Supprime des lignes (triées du haut vers le bas) et ajoute des lignes vides au-dessus"""
+        lowest = max(rows) if rows else -1
+        self.hash ^= cleared_hash(self.rows, lowest)
+
+        for row in rows:
+            del self.rows[row]
+            self.rows.insert(0, 0)
+            del self.cells[row]
+            self.cells.insert(0, [0 for _ in range(GRID_WIDTH)])
+
+        self.hash ^= cleared_hash(self.rows, lowest)
+
+def fits(rows, shape, position):
+    """Test de collision par décalage et ET logique sur des masques de lignes"""
+    row, column = position
+    if row < 0 or column + shape.min_col < 0 or column + shape.max_col >= GRID_WIDTH:
+        return False
+
+    masks = shape.masks
+    if row + len(masks) > GRID_HEIGHT:
+        return False
+
+    for x, mask in enumerate(masks):
+        if rows[row + x] & (mask << column):
+            return False
+    return True
+
+def landing_row(heights, shape, column):
+    """Ligne d'arrivée d'une pièce lâchée depuis le haut, calculée sur les hauteurs de colonnes.
+
+    Chaque colonne de la pièce peut descendre jusqu'à ce que sa case la plus
+    basse touche le sommet de la colonne : la ligne d'arrivée est le minimum
+    sur la largeur de la pièce. Renvoie -1 si la pièce ne rentre pas.
+    """
+    if column + shape.min_col < 0 or column + shape.max_col >= GRID_WIDTH:
+        return -1
+
+    landing = GRID_HEIGHT
+    for y, bottom in shape.skirt:
+        row = GRID_HEIGHT - heights[column + y] - 1 - bottom
+        if row < landing:
+            landing = row
+    return landing if landing >= 0 else -1
+
+def make_move(rows, shape, position, features=None, zhash=0):
+    """Pose une rotation de pièce et efface les lignes complètes sur place, sans copier la grille.
+
+    Si `features` est fourni, ses caractéristiques sont mises à jour au fil du
+    coup (elles se restaurent avec `snapshot`/`restore`). Le hachage de Zobrist
+    `zhash` de la grille est mis à jour incrémentalement. Renvoie un petit
+    enregistrement d'annulation pour `unmake_move` dont le dernier élément est
+    le hachage après le coup.
+    """
+    row, column = position
+    cleared = ()
+    for x, mask in enumerate(shape.masks):
+        old = rows[row + x]
+        rows[row + x] = old | mask << column
+        zhash ^= ZOBRIST[row + x][old] ^ ZOBRIST[row + x][rows[row + x]]
+        if rows[row + x] == FULL_ROW:
+            cleared += (row + x,)
+
+    if features is not None:
+        features.on_lock(rows, shape, position)
+
+    if cleared:
+        zhash ^= cleared_hash(rows, cleared[-1])
+
+        # Tasser les lignes restantes vers le bas, puis vider le haut
+        write = GRID_HEIGHT - 1
+        for read in range(GRID_HEIGHT - 1, -1, -1):
+            if rows[read] != FULL_ROW:
+                rows[write] = rows[read]
+                write -= 1
+        for r in range(write + 1):
+            rows[r] = 0
+
+        zhash ^= cleared_hash(rows, cleared[-1])
+
+        if features is not None:
+            features.on_clear(rows, cleared)
+
+    return (shape, position, cleared, zhash)
+
+def unmake_move(rows, undo):
+    """Annule sur place un coup joué par `make_move`"""
+    shape, (row, column), cleared, _ = undo
+
+    if cleared:
+        # Réinsérer les lignes pleines du haut vers le bas : chaque ligne
+        # d'origine est lue plus bas qu'elle n'est écrite
+        count = len(cleared)
+        index = 0
+        for r in range(GRID_HEIGHT):
+            if index < count and cleared[index] == r:
+                rows[r] = FULL_ROW
+                index += 1
+            else:
+                rows[r] = rows[r + count - index]
+
+    for x, mask in enumerate(shape.masks):
+        rows[row + x] &= ~(mask << column)
+
+def column_heights(rows):
+    """Hauteur de chaque colonne (0 pour une colonne vide)"""
+    heights = [0] * GRID_WIDTH
+    seen = 0
+    for row in range(GRID_HEIGHT):
+        new_bits = rows[row] & ~seen
+        if new_bits:
+            seen |= new_bits
+            for col in range(GRID_WIDTH):
+                if new_bits >> col & 1:
+                    heights[col] = GRID_HEIGHT - row
+            if seen == FULL_ROW:
+                break
+    return heights
+
+def count_holes(rows):
+    """Nombre de cases vides ayant un bloc au-dessus dans leur colonne"""
+    holes = 0
+    covered = 0
+    for mask in rows:
+        holes += POPCOUNT[covered & ~mask]
+        covered |= mask
+    return holes
+
+def count_transitions(rows):
+    """Nombre de changements bloc/vide entre deux lignes consécutives"""
+    transitions = 0
+    for row in range(1, GRID_HEIGHT):
+        transitions += POPCOUNT[rows[row] ^ rows[row - 1]]
+    return transitions
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+# Valeur renvoyée par `LRUCache.get` pour une clé absente
+MISSING = object()
+
+class LRUCache:
+    """Cache borné qui oublie l'entrée utilisée le moins récemment.
+
+    Compte les succès et les échecs de lecture pour mesurer son efficacité.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=MISSING):
+        """Valeur associée à `key` (marquée comme récente), ou `default` si absente"""
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Enregistre une valeur en évinçant la plus ancienne si le cache est plein"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Compteurs du cache sous forme de dictionnaire"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,58 @@
+from enum import Enum
+
+class PlayerType(Enum):
+    HUMAN = 0
+    AI = 1
+
+# Dimensions de la grille
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# Profondeur de recherche de l'IA par défaut (nombre de pièces anticipées)
+AI_DEPTH = 2
+
+# Couleurs des pièces
+COLORS = {
+    'I': '#00FFFF',  # Cyan
+    'O': '#FFFF00',  # Jaune
+    'T': '#800080',  # Violet
+    'S': '#00FF00',  # Vert
+    'Z': '#FF0000',  # Rouge
+    'J': '#0000FF',  # Bleu
+    'L': '#FF7F00',  # Orange
+    'HEART': '#FF69B4',  # Rose pour la pièce en forme de cœur
+    'STAR': '#FFD700',  # Or pour la pièce en forme d'étoile
+}
+
+# Définition des pièces standard
+SHAPES = {
+    'I': [[(0, 0), (0, 1), (0, 2), (0, 3)],
+          [(0, 0), (1, 0), (2, 0), (3, 0)]],
+    'O': [[(0, 0), (0, 1), (1, 0), (1, 1)]],
+    'T': [[(0, 0), (0, 1), (0, 2), (1, 1)],
+          [(0, 1), (1, 0), (1, 1), (2, 1)],
+          [(1, 0), (0, 1), (1, 1), (1, 2)],
+          [(0, 0), (1, 0), (2, 0), (1, 1)]],
+    'S': [[(0, 1), (0, 2), (1, 0), (1, 1)],
+          [(0, 0), (1, 0), (1, 1), (2, 1)]],
+    'Z': [[(0, 0), (0, 1), (1, 1), (1, 2)],
+          [(0, 1), (1, 0), (1, 1), (2, 0)]],
+    'J': [[(0, 0), (1, 0), (1, 1), (1, 2)],
+          [(0, 0), (0, 1), (1, 0), (2, 0)],
+          [(0, 0), (0, 1), (0, 2), (1, 2)],
+          [(0, 1), (1, 1), (2, 0), (2, 1)]],
+    'L': [[(0, 0), (0, 1), (0, 2), (1, 0)],
+          [(0, 0), (1, 0), (2, 0), (2, 1)],
+          [(0, 2), (1, 0), (1, 1), (1, 2)],
+          [(0, 0), (0, 1), (1, 1), (2, 1)]],
+    # Pièces spéciales
+    'HEART': [[(0, 1), (1, 0), (1, 1), (1, 2), (2, 1)]],
+    'STAR': [[(0, 2), (1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 2)]]
+}
+
+# Pièces standards (non spéciales)
+STANDARD_SHAPES = ['I', 'O', 'T', 'S', 'Z', 'J', 'L']
+# Pièces faciles à placer
+EASY_SHAPES = ['I', 'O']
+# Pièces spéciales
+SPECIAL_SHAPES = ['HEART', 'STAR']
@@ -0,0 +1,360 @@
+import time
+from enum import Enum
+
+import instrument
+from board import Board
+from features import BoardFeatures
+from pieces import PieceSource
+from shapes import SHAPE_REGISTRY, Piece
+from constants import (
+    PlayerType, GRID_WIDTH, GRID_HEIGHT,
+    EASY_SHAPES, SPECIAL_SHAPES,
+)
+
+class Action(Enum):
+    LEFT = 0
+    RIGHT = 1
+    DOWN = 2
+    ROTATE = 3
+    DROP = 4
+
+# Points par ligne: 100, 300, 500, 800 pour 1, 2, 3, 4 lignes
+LINE_POINTS = {1: 100, 2: 300, 3: 500, 4: 800}
+
+class ChangeLog:
+    """Cases d'un joueur modifiées depuis le dernier affichage.
+
+    Les déplacements de pièce, les poses et les apparitions marquent les cases
+    touchées ; un effacement de lignes est noté comme un décalage de lignes que
+    l'affichage rejoue sur ce qu'il montre déjà. Les cases marquées sont
+    toujours exprimées dans les coordonnées après le dernier décalage.
+    """
+    def __init__(self):
+        self.cells = set()
+        self.shifts = []  # Lignes effacées de chaque effacement, dans l'ordre
+        self.full = True  # Tout redessiner (premier affichage)
+
+    def mark_piece(self, piece_type, rotation, position):
+        """Marque les cases couvertes par une pièce"""
+        row, column = position
+        shape = SHAPE_REGISTRY[piece_type]
+        for x, y in shape.rotations[rotation % shape.count].cells:
+            if 0 <= row + x < GRID_HEIGHT and 0 <= column + y < GRID_WIDTH:
+                self.cells.add((row + x, column + y))
+
+    def shift_rows(self, cleared_rows):
+        """Note l'effacement de lignes (triées du haut vers le bas)"""
+        if self.full:
+            return
+        if len(self.shifts) >= GRID_HEIGHT:
+            # Personne n'affiche ce joueur : un redessin complet coûtera moins cher
+            self.full = True
+            self.shifts = []
+            self.cells = set()
+            return
+        self.shifts.append(tuple(cleared_rows))
+
+        # Les cases déjà marquées descendent avec leur ligne
+        cleared = set(cleared_rows)
+        cells = set()
+        for row, col in self.cells:
+            if row not in cleared:
+                cells.add((row + sum(1 for r in cleared_rows if r > row), col))
+
+        # Les lignes vides ajoutées en haut sont à redessiner
+        for row in range(len(cleared_rows)):
+            for col in range(GRID_WIDTH):
+                cells.add((row, col))
+        self.cells = cells
+
+    def take(self):
+        """Renvoie (full, shifts, cells) et repart d'un journal vide"""
+        changes = (self.full, self.shifts, self.cells)
+        self.full = False
+        self.shifts = []
+        self.cells = set()
+        return changes
+
+class PlayerState:
+    """État de jeu d'un joueur : grille, pièces, score et vitesse"""
+    def __init__(self, speed, piece_source=None):
+        # Suite des pièces du joueur
+        self.piece_source = piece_source or PieceSource()
+
+        # Grille en masques de bits (cases : 0 = vide, 1 = bloc, type de pièce spéciale sinon)
+        self.board = Board()
+
+        # Caractéristiques de la grille (hauteurs, trous...) tenues à jour par le moteur
+        self.features = BoardFeatures()
+
+        # Cases modifiées depuis le dernier affichage
+        self.changes = ChangeLog()
+
+        # Pièces actuelle et suivante
+        self.current_piece = None
+        self.next_piece = None
+
+        # Position et orientation de la pièce actuelle
+        self.position = (0, 0)
+        self.rotation = 0
+
+        # Score, niveau et vitesse de chute (ms)
+        self.score = 0
+        self.level = 1
+        self.speed = speed
+
+        # Statistiques de la partie
+        self.lines = 0
+        self.pieces = 0
+
+class TetrisEngine:
+    """Moteur de jeu sans interface : grilles, pièces, score et règles spéciales.
+
+    Ce module n'importe pas tkinter : il peut tourner sur un serveur sans
+    affichage. L'horloge est injectable pour découpler les règles temporelles
+    du temps réel. Avec une graine (`seed`), chaque joueur reçoit sa propre
+    suite de pièces reproductible ; `bag=True` les distribue par sacs de 7.
+    """
+    def __init__(self, clock=None, seed=None, bag=False):
+        self.clock = clock or time.monotonic
+        self.start_time = self.clock()
+
+        self.players = {
+            PlayerType.HUMAN: PlayerState(speed=1000, piece_source=self.piece_source(seed, PlayerType.HUMAN, bag)),
+            PlayerType.AI: PlayerState(speed=500, piece_source=self.piece_source(seed, PlayerType.AI, bag)),  # IA légèrement plus rapide
+        }
+
+        # Flags des règles spéciales
+        self.slow_mode_active = False
+        self.slow_mode_start_time = 0
+        self.rainbow_mode_active = False
+        self.rainbow_mode_start_time = 0
+
+        # Indicateurs de jeu
+        self.game_over = False
+        self.winner = None
+
+    @staticmethod
+    def piece_source(seed, player_type, bag):
+        """Suite de pièces d'un joueur, dérivée de la graine de la partie"""
+        return PieceSource(None if seed is None else f"{seed}/{player_type.name}", bag)
+
+    def elapsed(self):
+        """Temps écoulé (s) depuis le début de la partie"""
+        return self.clock() - self.start_time
+
+    def start(self):
+        """Génère les premières pièces et les fait apparaître"""
+        for player_type in (PlayerType.HUMAN, PlayerType.AI):
+            self.players[player_type].next_piece = self.generate_piece(player_type)
+
+        for player_type in (PlayerType.HUMAN, PlayerType.AI):
+            self.spawn_piece(player_type)
+
+    def generate_piece(self, player_type, type_override=None):
+        """Génère une nouvelle pièce de jeu à partir de la suite du joueur"""
+        source = self.players[player_type].piece_source
+
+        # Vérifier si on doit forcer un type spécifique
+        if type_override:
+            piece_type = type_override
+        else:
+            # Déterminer si on génère une pièce spéciale (elle s'intercale dans la suite standard)
+            human_score = self.players[PlayerType.HUMAN].score
+            ai_score = self.players[PlayerType.AI].score
+            if (human_score >= 3000 and human_score % 3000 < 100) or \
+               (ai_score >= 3000 and ai_score % 3000 < 100):
+                piece_type = source.choice(SPECIAL_SHAPES)
+            else:
+                piece_type = source.next()
+
+        # Générer la pièce
+        return Piece(piece_type)
+
+    def spawn_piece(self, player_type):
+        """Fait apparaître la pièce suivante, renvoie False en cas de game over"""
+        if self.game_over:
+            return False
+
+        player = self.players[player_type]
+
+        # La pièce suivante devient la pièce actuelle
+        player.current_piece = player.next_piece
+        player.next_piece = self.generate_piece(player_type)
+
+        # Définir la position de départ
+        player.position = (0, GRID_WIDTH // 2 - 1)
+        player.rotation = 0
+        player.changes.mark_piece(player.current_piece.type, player.rotation, player.position)
+
+        # Vérifier si la pièce peut être placée, sinon game over
+        if not self.is_valid_position(player.current_piece, player.position,
+                                      player.rotation, player_type):
+            self.game_over = True
+            self.winner = PlayerType.AI if player_type == PlayerType.HUMAN else PlayerType.HUMAN
+            return False
+
+        return True
+
+    def preview(self, player_type, count):
+        """Types des `count` prochaines pièces d'un joueur (la pièce suivante d'abord)"""
+        player = self.players[player_type]
+        if count <= 0:
+            return []
+        return [player.next_piece.type] + player.piece_source.peek(count - 1)
+
+    def is_valid_position(self, piece, position, rotation, player_type):
+        """Vérifie si une position est valide pour une pièce"""
+        if not piece:
+            return False
+
+        # Test de collision sur les masques de la rotation donnée
+        rotation %= piece.shape.count
+        return self.players[player_type].board.is_valid(piece.shape.rotations[rotation], position)
+
+    def step(self, player_type, action):
+        """Applique une action pour un joueur et renvoie ce qui s'est passé.
+
+        Le résultat est un dictionnaire avec les clés 'moved', 'locked',
+        'lines_cleared', 'cleared_rows' et 'game_over'.
+        """
+        result = {'moved': False, 'locked': False, 'lines_cleared': 0,
+                  'cleared_rows': [], 'game_over': self.game_over}
+
+        player = self.players[player_type]
+        if self.game_over or not player.current_piece:
+            return result
+
+        row, col = player.position
+
+        if action == Action.LEFT:
+            result['moved'] = self.try_move(player_type, (row, col - 1), player.rotation)
+        elif action == Action.RIGHT:
+            result['moved'] = self.try_move(player_type, (row, col + 1), player.rotation)
+        elif action == Action.ROTATE:
+            new_rotation = (player.rotation + 1) % player.current_piece.shape.count
+            result['moved'] = self.try_move(player_type, player.position, new_rotation)
+        elif action == Action.DOWN:
+            result['moved'] = self.try_move(player_type, (row + 1, col), player.rotation)
+            if not result['moved']:
+                self.settle_piece(player_type, result)
+        elif action == Action.DROP:
+            while self.try_move(player_type, (player.position[0] + 1, col), player.rotation):
+                result['moved'] = True
+            self.settle_piece(player_type, result)
+
+        result['game_over'] = self.game_over
+        return result
+
+    def try_move(self, player_type, position, rotation):
+        """Déplace la pièce si la nouvelle position est valide"""
+        player = self.players[player_type]
+        if not self.is_valid_position(player.current_piece, position, rotation, player_type):
+            return False
+
+        # L'ancienne et la nouvelle place de la pièce sont à redessiner
+        piece_type = player.current_piece.type
+        player.changes.mark_piece(piece_type, player.rotation, player.position)
+        player.changes.mark_piece(piece_type, rotation, position)
+
+        player.position = position
+        player.rotation = rotation
+        return True
+
+    def settle_piece(self, player_type, result):
+        """Fixe la pièce, efface les lignes, applique les règles et fait apparaître la suivante"""
+        self.lock_piece(player_type)
+        cleared_rows = self.clear_lines(player_type)
+        self.apply_special_rules(len(cleared_rows), player_type)
+        self.spawn_piece(player_type)
+
+        result['locked'] = True
+        result['cleared_rows'] = cleared_rows
+        result['lines_cleared'] = len(cleared_rows)
+
+    @instrument.timed('lock')
+    def lock_piece(self, player_type):
+        """Fixe une pièce dans la grille"""
+        player = self.players[player_type]
+        piece = player.current_piece
+
+        rotation = player.rotation % piece.shape.count
+        shape = piece.shape.rotations[rotation]
+
+        # Pour les pièces spéciales, utiliser un identifiant spécial
+        value = piece.type if piece.shape.special else 1
+        player.board.place(shape, player.position, value)
+        player.features.on_lock(player.board.rows, shape, player.position)
+        player.changes.mark_piece(piece.type, rotation, player.position)
+
+        player.pieces += 1
+
+    @instrument.timed('clear_lines')
+    def clear_lines(self, player_type):
+        """Efface les lignes complètes, met à jour le score et renvoie les lignes effacées"""
+        player = self.players[player_type]
+
+        # Trouver les lignes complètes (masque égal à FULL_ROW)
+        lines_to_clear = player.board.full_rows()
+
+        # Si aucune ligne à effacer, retourner
+        if not lines_to_clear:
+            return []
+
+        # Supprimer les lignes complètes et ajouter des lignes vides au-dessus
+        player.board.clear_rows(lines_to_clear)
+        player.features.on_clear(player.board.rows, lines_to_clear)
+        player.changes.shift_rows(lines_to_clear)
+
+        # Mettre à jour le score
+        lines_count = len(lines_to_clear)
+        player.score += LINE_POINTS.get(lines_count, lines_count * 200)  # Valeur par défaut pour 5+ lignes
+        player.lines += lines_count
+
+        return lines_to_clear
+
+    def apply_special_rules(self, lines_cleared, player_type):
+        """Applique les règles spéciales en fonction des lignes effacées"""
+        # Règle 1: Cadeau surprise - si un joueur complète 2 lignes d'un coup, l'adversaire reçoit une pièce facile
+        if lines_cleared == 2:
+            opponent = PlayerType.AI if player_type == PlayerType.HUMAN else PlayerType.HUMAN
+            easy_type = self.players[opponent].piece_source.choice(EASY_SHAPES)
+            self.players[opponent].next_piece = self.generate_piece(opponent, type_override=easy_type)
+
+        # Règle 2: Pause douceur - tous les 1000 points, la vitesse de chute est réduite de 20% pendant 10 secondes
+        current_score = self.players[player_type].score
+        if current_score % 1000 < 50 and current_score > 0 and not self.slow_mode_active:
+            self.slow_mode_active = True
+            self.slow_mode_start_time = self.elapsed()
+
+            # Réduire la vitesse de chute
+            for player in self.players.values():
+                player.speed = int(player.speed * 1.2)
+
+    def update_special_events(self):
+        """Vérifie et gère les événements spéciaux récurrents"""
+        current_time = self.elapsed()
+
+        # Fin du mode ralenti
+        if self.slow_mode_active and current_time - self.slow_mode_start_time > 10:
+            self.slow_mode_active = False
+            for player in self.players.values():
+                player.speed = int(player.speed / 1.2)
+
+        # Règle 4: Arc-en-ciel - toutes les 2 minutes (120 secondes), les pièces changent de couleur
+        minutes_elapsed = int(current_time / 120)
+        if minutes_elapsed > 0 and not self.rainbow_mode_active and current_time % 120 < 20:
+            self.rainbow_mode_active = True
+            self.rainbow_mode_start_time = current_time
+
+        # Fin du mode arc-en-ciel
+        if self.rainbow_mode_active and current_time - self.rainbow_mode_start_time > 20:
+            self.rainbow_mode_active = False
+
+    def special_rules_text(self):
+        """Texte décrivant les règles spéciales actives"""
+        if self.rainbow_mode_active:
+            return "Mode Arc-en-ciel actif!"
+        if self.slow_mode_active:
+            return "Mode Ralenti actif!"
+        return "Aucune règle active"
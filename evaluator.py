@@ -0,0 +1,78 @@
+"""Évaluation des poses de l'IA : caractéristiques nommées et vecteur de poids.
+
+Le score d'une pose est la somme pondérée des caractéristiques de la grille
+après la pose, telles que calculées (une seule fois, de façon incrémentale)
+par `BoardFeatures.placement`. Les poids se chargent depuis un profil JSON :
+{"weights": {"holes": -15, ...}} ; les poids absents gardent leur valeur
+par défaut, celle de l'heuristique d'origine.
+"""
+import json
+
+# Caractéristiques notées, dans l'ordre du vecteur de poids
+FEATURES = ('lines_cleared', 'height_sum', 'holes', 'transitions', 'bumpiness', 'max_height', 'wells')
+
+# Caractéristiques de surface : inutile de les calculer si leurs poids sont nuls
+SURFACE_FEATURES = ('transitions', 'bumpiness', 'wells')
+
+DEFAULT_WEIGHTS = {
+    'lines_cleared': 150,   # Lignes complétées
+    'height_sum': -0.6,     # Hauteur de la pile
+    'holes': -15,           # Trous (cases vides avec des blocs au-dessus)
+    'transitions': -0.3,    # Transitions bloc/vide
+    'bumpiness': -1.0,      # Rugosité (différences de hauteur entre colonnes voisines)
+    'max_height': -2.0,     # Placements en hauteur
+    'wells': 10,            # Puits pour Tetris
+}
+
+# Les puits ne comptent qu'au-dessus de cette hauteur, et jamais pour la pièce I
+WELL_MIN_HEIGHT = 4
+
+class Evaluator:
+    """Score linéaire d'une pose à partir de ses caractéristiques nommées"""
+    def __init__(self, weights=None):
+        weights = dict(weights or {})
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Caractéristiques inconnues : {', '.join(sorted(unknown))}")
+        self.weights = {name: weights.get(name, DEFAULT_WEIGHTS[name]) for name in FEATURES}
+
+        # Termes non nuls évalués à chaque pose, les puits étant traités à part
+        self.terms = [(name, self.weights[name]) for name in FEATURES
+                      if name != 'wells' and self.weights[name]]
+        self.well_weight = self.weights['wells']
+        self.surface = any(self.weights[name] for name in SURFACE_FEATURES)
+
+    @classmethod
+    def load(cls, path):
+        """Évaluateur d'un profil JSON ({"weights": {...}} ou directement les poids)"""
+        with open(path) as f:
+            profile = json.load(f)
+        return cls(profile.get('weights', profile))
+
+    @classmethod
+    def from_vector(cls, vector):
+        """Évaluateur d'un vecteur de poids dans l'ordre de FEATURES"""
+        return cls(dict(zip(FEATURES, vector)))
+
+    def vector(self):
+        """Poids dans l'ordre de FEATURES"""
+        return [self.weights[name] for name in FEATURES]
+
+    def save(self, path, **metadata):
+        """Écrit le profil JSON des poids, avec d'éventuelles informations en plus"""
+        with open(path, 'w') as f:
+            json.dump(dict(metadata, weights=self.weights), f, indent=2)
+
+    def score(self, placed, piece_type):
+        """Score d'une pose décrite par `BoardFeatures.placement`"""
+        score = 0
+        for name, weight in self.terms:
+            score += placed[name] * weight
+
+        if self.well_weight and placed['max_height'] > WELL_MIN_HEIGHT and piece_type != 'I':
+            score += placed['wells'] * self.well_weight
+
+        return score
+
+    def __repr__(self):
+        return f"Evaluator({self.weights!r})"
@@ -0,0 +1,195 @@
+from board import FULL_ROW, POPCOUNT, column_heights, count_transitions, landing_row
+from constants import GRID_WIDTH, GRID_HEIGHT
+
+def column_holes(rows, col, height):
+    """Nombre de cases vides sous le sommet d'une colonne"""
+    holes = 0
+    bit = 1 << col
+    for row in range(GRID_HEIGHT - height, GRID_HEIGHT):
+        if not rows[row] & bit:
+            holes += 1
+    return holes
+
+def is_well(heights, col):
+    """Vrai si la colonne est un puits profond idéal pour une pièce I"""
+    return heights[col] < heights[col-1] - 3 and heights[col] < heights[col+1] - 3
+
+class BoardFeatures:
+    """Caractéristiques d'une grille tenues à jour à chaque pièce fixée.
+
+    Hauteurs et trous sont gardés par colonne, transitions, rugosité et puits
+    en totaux. Fixer une pièce ne recalcule que les colonnes qu'elle touche, et
+    `placement` évalue un coup candidat sans parcourir toute la grille.
+    """
+    def __init__(self, rows=None):
+        self.rebuild(rows if rows is not None else [0] * GRID_HEIGHT)
+
+    def rebuild(self, rows):
+        """Recalcule toutes les caractéristiques à partir des masques de lignes"""
+        self.heights = column_heights(rows)
+        self.holes = [column_holes(rows, col, self.heights[col]) for col in range(GRID_WIDTH)]
+        self.hole_count = sum(self.holes)
+        self.transitions = count_transitions(rows)
+        self.refresh_surface()
+
+    def refresh_surface(self):
+        """Recalcule rugosité et puits à partir des hauteurs (O(largeur))"""
+        heights = self.heights
+        self.height_sum = sum(heights)
+        self.max_height = max(heights)
+        self.bumpiness = sum(abs(heights[i] - heights[i+1]) for i in range(GRID_WIDTH - 1))
+        self.wells = sum(1 for col in range(1, GRID_WIDTH - 1) if is_well(heights, col))
+
+    def copy(self):
+        """Copie indépendante des caractéristiques"""
+        features = BoardFeatures.__new__(BoardFeatures)
+        features.heights = self.heights[:]
+        features.holes = self.holes[:]
+        features.hole_count = self.hole_count
+        features.transitions = self.transitions
+        features.height_sum = self.height_sum
+        features.max_height = self.max_height
+        features.bumpiness = self.bumpiness
+        features.wells = self.wells
+        return features
+
+    def snapshot(self):
+        """État courant, à restaurer avec `restore` après un coup simulé"""
+        return (tuple(self.heights), tuple(self.holes), self.hole_count, self.transitions,
+                self.height_sum, self.max_height, self.bumpiness, self.wells)
+
+    def restore(self, snapshot):
+        """Restaure sur place un état obtenu par `snapshot`"""
+        heights, holes, self.hole_count, self.transitions, \
+            self.height_sum, self.max_height, self.bumpiness, self.wells = snapshot
+        self.heights[:] = heights
+        self.holes[:] = holes
+
+    def on_lock(self, rows, shape, position):
+        """Met à jour les caractéristiques après la pose d'une rotation de pièce (masques déjà mis à jour)"""
+        row, column = position
+        masks = shape.masks
+
+        # Transitions : seules les paires de lignes autour de la pièce changent
+        self.transitions += self._transition_delta(rows, masks, row, column, placed=True)
+
+        # Hauteurs et trous des colonnes touchées (la pièce a pu glisser sous un surplomb)
+        for y, _, _ in shape.columns:
+            col = column + y
+            self.heights[col] = column_height(rows, col)
+            holes = column_holes(rows, col, self.heights[col])
+            self.hole_count += holes - self.holes[col]
+            self.holes[col] = holes
+
+        self.refresh_surface()
+
+    def on_clear(self, rows, cleared_rows):
+        """Met à jour les caractéristiques après l'effacement de lignes complètes"""
+        cleared = set(cleared_rows)
+        count = len(cleared_rows)
+        for col in range(GRID_WIDTH):
+            if not self.heights[col]:
+                continue
+            if GRID_HEIGHT - self.heights[col] in cleared:
+                # Le sommet de la colonne a disparu : les cases vides dessous ne sont plus des trous
+                self.heights[col] = column_height(rows, col)
+                holes = column_holes(rows, col, self.heights[col])
+                self.hole_count += holes - self.holes[col]
+                self.holes[col] = holes
+            else:
+                # Les lignes effacées étaient pleines : la colonne baisse sans changer de trous
+                self.heights[col] -= count
+
+        self.transitions = count_transitions(rows)
+        self.refresh_surface()
+
+    def placement(self, rows, shape, column, surface=True):
+        """Caractéristiques de la grille après avoir lâché une rotation de pièce, sans la modifier.
+
+        Seules les colonnes et les lignes touchées par la pièce sont examinées.
+        Les lignes complètes ne sont pas effacées, comme dans l'heuristique de
+        l'IA. Avec surface=False, rugosité, puits et transitions ne sont pas
+        calculés. Renvoie None si la pièce ne rentre pas.
+        """
+        heights = self.heights
+        row = landing_row(heights, shape, column)
+        if row < 0:
+            return None
+
+        masks = shape.masks
+
+        # Lignes complétées par la pièce
+        lines_cleared = 0
+        for x, mask in enumerate(masks):
+            if rows[row + x] | (mask << column) == FULL_ROW:
+                lines_cleared += 1
+
+        # Nouvelles hauteurs et trous des colonnes touchées (la pièce arrive par le haut)
+        new_heights = {}
+        holes = self.hole_count
+        height_sum = self.height_sum
+        max_height = self.max_height
+        for y, top_offset, cells in shape.columns:
+            col = column + y
+            top = row + top_offset
+            holes += (GRID_HEIGHT - heights[col]) - top - cells
+            new_heights[col] = GRID_HEIGHT - top
+            height_sum += new_heights[col] - heights[col]
+            if new_heights[col] > max_height:
+                max_height = new_heights[col]
+
+        placed = {
+            'landing_row': row,
+            'lines_cleared': lines_cleared,
+            'height_sum': height_sum,
+            'holes': holes,
+            'max_height': max_height,
+        }
+        if not surface:
+            return placed
+
+        # Rugosité et puits : seules les colonnes voisines de la pièce changent
+        first = min(new_heights)
+        last = max(new_heights)
+        local = heights[:]
+        for col, h in new_heights.items():
+            local[col] = h
+
+        bumpiness = self.bumpiness
+        for i in range(max(first - 1, 0), min(last + 1, GRID_WIDTH - 1)):
+            bumpiness += abs(local[i] - local[i+1]) - abs(heights[i] - heights[i+1])
+
+        wells = self.wells
+        for col in range(max(first - 1, 1), min(last + 2, GRID_WIDTH - 1)):
+            wells += is_well(local, col) - is_well(heights, col)
+
+        placed['bumpiness'] = bumpiness
+        placed['wells'] = wells
+        placed['transitions'] = self.transitions + self._transition_delta(rows, masks, row, column, placed=False)
+        return placed
+
+    @staticmethod
+    def _transition_delta(rows, masks, row, column, placed):
+        """Variation des transitions sur les paires de lignes entourant la pièce"""
+        start = max(row - 1, 0)
+        window = rows[start:min(row + len(masks) + 1, GRID_HEIGHT)]
+        other = window[:]
+        for x, mask in enumerate(masks):
+            if placed:
+                other[row + x - start] &= ~(mask << column)
+            else:
+                other[row + x - start] |= mask << column
+
+        # `window` est l'état des masques fourni, `other` l'état avec/sans la pièce
+        delta = 0
+        for i in range(1, len(window)):
+            delta += POPCOUNT[other[i] ^ other[i-1]] - POPCOUNT[window[i] ^ window[i-1]]
+        return -delta if placed else delta
+
+def column_height(rows, col):
+    """Hauteur d'une seule colonne"""
+    bit = 1 << col
+    for row in range(GRID_HEIGHT):
+        if rows[row] & bit:
+            return GRID_HEIGHT - row
+    return 0
@@ -0,0 +1,170 @@
+"""Instrumentation des chemins critiques : chronomètres, compteurs et histogrammes.
+
+Exemple : TETRIS_PROFILE=1 TETRIS_PROFILE_PERIOD=5 python main.py
+
+L'instrumentation est activée au chargement du module par la variable
+d'environnement TETRIS_PROFILE. Désactivée, `timed` rend les fonctions
+telles quelles et `count`/`observe` ne font rien : le coût est nul sur les
+chemins critiques. Activée, chaque fenêtre de TETRIS_PROFILE_PERIOD secondes
+(10 par défaut) est résumée en une ligne JSON (durées par opération avec
+percentiles et histogramme en puissances de 2, compteurs), écrite sur la
+sortie d'erreur ou ajoutée au fichier TETRIS_PROFILE_OUTPUT.
+"""
+import atexit
+import functools
+import json
+import multiprocessing.util
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get('TETRIS_PROFILE', '') not in ('', '0')
+
+# Durée (s) d'une fenêtre de mesure et fichier des rapports (sortie d'erreur si absent)
+DUMP_PERIOD = float(os.environ.get('TETRIS_PROFILE_PERIOD', 10))
+OUTPUT = os.environ.get('TETRIS_PROFILE_OUTPUT')
+
+class Timer:
+    """Durées d'une opération sur la fenêtre en cours"""
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # Histogramme : nombre de bits de la durée (ns) -> nombre d'appels
+        self.buckets = {}
+
+    def add(self, ns):
+        self.calls += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        bucket = ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        """Percentile (µs) interpolé dans sa tranche de l'histogramme, jamais au-delà du maximum"""
+        rank = fraction * self.calls
+        seen = 0
+        for bucket in sorted(self.buckets):
+            calls = self.buckets[bucket]
+            if seen + calls >= rank:
+                # La tranche `bucket` couvre les durées de [2^(bucket-1), 2^bucket[ ns
+                low = 1 << bucket >> 1
+                ns = low + (low or 1) * (rank - seen) / calls
+                return min(ns, self.max_ns) / 1000
+            seen += calls
+        return self.max_ns / 1000
+
+    def summary(self):
+        return {
+            'calls': self.calls,
+            'total_ms': self.total_ns / 1e6,
+            'mean_us': self.total_ns / self.calls / 1000,
+            'p50_us': self.percentile(0.50),
+            'p99_us': self.percentile(0.99),
+            'max_us': self.max_ns / 1000,
+            'histogram_us': {str((1 << bucket) / 1000): calls for bucket, calls in sorted(self.buckets.items())},
+        }
+
+class Profiler:
+    """Mesures de la fenêtre en cours, résumées et remises à zéro à chaque rapport"""
+    def __init__(self, period=DUMP_PERIOD, output=OUTPUT):
+        self.period = period
+        self.output = output
+        self.reset()
+
+    def reset(self):
+        """Vide les mesures et commence une nouvelle fenêtre"""
+        self.lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+        self.window_start = time.perf_counter()
+
+    def add_time(self, name, ns):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer()
+            timer.add(ns)
+            due = time.perf_counter() - self.window_start >= self.period
+        if due:
+            self.dump()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """Résumé de la fenêtre en cours, puis début d'une nouvelle fenêtre"""
+        with self.lock:
+            now = time.perf_counter()
+            timers, self.timers = self.timers, {}
+            counters, self.counters = self.counters, {}
+            window, self.window_start = now - self.window_start, now
+        return {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'window_s': window,
+            'timers': {name: timer.summary() for name, timer in sorted(timers.items())},
+            'counters': dict(sorted(counters.items())),
+        }
+
+    def dump(self):
+        """Écrit le résumé de la fenêtre en cours (rien si elle est vide)"""
+        report = self.report()
+        if not report['timers'] and not report['counters']:
+            return
+        line = json.dumps(report) + '\n'
+        if self.output:
+            with open(self.output, 'a') as f:
+                f.write(line)
+        else:
+            sys.stderr.write(line)
+
+def _after_fork(profiler):
+    """Processus de calcul : mesures propres au processus, dernière fenêtre écrite à sa sortie"""
+    profiler.reset()
+    multiprocessing.util.Finalize(None, profiler.dump, exitpriority=10)
+
+def _identity(func):
+    return func
+
+def _timed_noop(name):
+    return _identity
+
+def _noop(name, amount=1):
+    pass
+
+def _timed(name):
+    """Décorateur : chaque appel de la fonction est chronométré sous `name`"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.add_time(name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+def _observe(name, seconds):
+    """Ajoute une durée mesurée ailleurs (retard de la boucle d'événements par exemple)"""
+    profiler.add_time(name, max(0, int(seconds * 1e9)))
+
+def _count(name, amount=1):
+    """Ajoute `amount` au compteur `name`"""
+    profiler.count(name, amount)
+
+if ENABLED:
+    profiler = Profiler()
+    timed, observe, count = _timed, _observe, _count
+    # Dernière fenêtre écrite à la sortie, y compris dans les processus de calcul
+    atexit.register(profiler.dump)
+    multiprocessing.util.register_after_fork(profiler, _after_fork)
+else:
+    profiler = None
+    timed, observe, count = _timed_noop, _noop, _noop
@@ -0,0 +1,48 @@
+import random
+from collections import deque
+from itertools import islice
+
+from constants import STANDARD_SHAPES
+
+class PieceSource:
+    """Suite des types de pièces d'un joueur, tirée de ses propres générateurs.
+
+    Les pièces standard viennent d'un générateur dédié, au hasard ou par sacs
+    de 7 (chaque pièce une fois par sac), et peuvent être consultées à
+    l'avance avec `peek`. Les tirages liés aux règles spéciales passent par
+    un second générateur pour ne pas décaler la suite standard. Avec une même
+    graine, la suite est identique d'une partie à l'autre.
+    """
+    def __init__(self, seed=None, bag=False):
+        self.seed = seed
+        self.bag = bag
+        self.rng = random.Random(seed)
+        self.event_rng = random.Random(None if seed is None else f"{seed}/events")
+
+        # Pièces standard déjà tirées mais pas encore distribuées
+        self.queue = deque()
+
+    def refill(self):
+        """Tire la prochaine pièce (ou le prochain sac) de la suite standard"""
+        if self.bag:
+            bag = list(STANDARD_SHAPES)
+            self.rng.shuffle(bag)
+            self.queue.extend(bag)
+        else:
+            self.queue.append(self.rng.choice(STANDARD_SHAPES))
+
+    def peek(self, count):
+        """Les `count` prochains types de la suite standard, sans les consommer"""
+        while len(self.queue) < count:
+            self.refill()
+        return list(islice(self.queue, count))
+
+    def next(self):
+        """Consomme et renvoie le prochain type de la suite standard"""
+        if not self.queue:
+            self.refill()
+        return self.queue.popleft()
+
+    def choice(self, shapes):
+        """Tire un type parmi `shapes` pour une règle spéciale"""
+        return self.event_rng.choice(shapes)
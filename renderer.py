@@ -0,0 +1,208 @@
+import time
+import tkinter as tk
+
+import instrument
+from constants import GRID_WIDTH, GRID_HEIGHT, COLORS
+
+# Couleurs du fond de la grille
+EMPTY_COLOR = "#34495E"
+EMPTY_INNER_COLOR = "#2C3E50"
+GRID_LINE_COLOR = "#2C3E50"
+
+# Couleur par défaut pour les blocs placés
+BLOCK_COLOR = "#7F8C8D"  # Gris
+
+def lighten_color(hex_color, factor=0.3):
+    """Éclaircit une couleur hexadécimale"""
+    # Convertir la couleur hex en RGB
+    hex_color = hex_color.lstrip('#')
+    r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+
+    # Éclaircir chaque composante
+    r = min(255, int(r + (255 - r) * factor))
+    g = min(255, int(g + (255 - g) * factor))
+    b = min(255, int(b + (255 - b) * factor))
+
+    # Reconvertir en hex
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+def darken_color(hex_color, factor=0.7):
+    """Assombrit une couleur hexadécimale"""
+    # Convertir la couleur hex en RGB
+    hex_color = hex_color.lstrip('#')
+    r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+
+    # Assombrir chaque composante
+    r = int(r * factor)
+    g = int(g * factor)
+    b = int(b * factor)
+
+    # Reconvertir en hex
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+# Teintes (claire, foncée) des bords 3D, calculées une seule fois par couleur de bloc
+PALETTE = {}
+
+def shades(color):
+    """Teintes claire et foncée d'une couleur de bloc, mémorisées dans PALETTE"""
+    palette = PALETTE.get(color)
+    if palette is None:
+        palette = PALETTE[color] = (lighten_color(color, 0.3), darken_color(color, 0.7))
+    return palette
+
+# Les couleurs des pièces et des blocs placés sont connues d'avance
+for _color in list(COLORS.values()) + [BLOCK_COLOR]:
+    shades(_color)
+
+class BoardRenderer:
+    """Affichage d'une grille en mode retenu sur un canvas Tk.
+
+    Les éléments de chaque case (fond vide, bloc et bords 3D) sont créés une
+    seule fois. Chaque affichage consomme le journal des changements du
+    joueur : les effacements de lignes déplacent les éléments existants et
+    seules les cases marquées sont comparées puis modifiées avec `itemconfig`.
+    """
+    def __init__(self, canvas, cell_size, rainbow_colors):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.rainbow_colors = rainbow_colors
+        for color in rainbow_colors:
+            shades(color)
+
+        # Dessiner les lignes de la grille (lignes légères pour visualiser les cellules)
+        for i in range(GRID_WIDTH + 1):
+            x = i * cell_size
+            canvas.create_line(x, 0, x, GRID_HEIGHT * cell_size, fill=GRID_LINE_COLOR, width=1)
+
+        for i in range(GRID_HEIGHT + 1):
+            y = i * cell_size
+            canvas.create_line(0, y, GRID_WIDTH * cell_size, y, fill=GRID_LINE_COLOR, width=1)
+        instrument.count('canvas_items_created', GRID_WIDTH + GRID_HEIGHT + 2)
+
+        # Éléments de chaque case, et couleur affichée (None pour une case vide).
+        # Les éléments d'une ligne partagent une étiquette pour être déplacés ensemble.
+        self.row_tags = [f"row{row}" for row in range(GRID_HEIGHT)]
+        self.items = [[self.create_cell(row, col) for col in range(GRID_WIDTH)] for row in range(GRID_HEIGHT)]
+        self.colors = [[None] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+
+        # Vrai si le dernier affichage utilisait les couleurs arc-en-ciel
+        self.rainbow = False
+
+    def create_cell(self, row, col):
+        """Crée les éléments d'une case : fond vide visible, bloc et bords cachés"""
+        canvas = self.canvas
+        tag = self.row_tags[row]
+        x1 = col * self.cell_size
+        y1 = row * self.cell_size
+        x2 = x1 + self.cell_size
+        y2 = y1 + self.cell_size
+
+        # Case vide avec effet de profondeur
+        empty = (
+            canvas.create_rectangle(x1, y1, x2, y2, fill=EMPTY_COLOR, outline=GRID_LINE_COLOR, tags=tag),
+            canvas.create_rectangle(x1+3, y1+3, x2-3, y2-3, fill=EMPTY_INNER_COLOR, outline="", tags=tag),
+        )
+
+        # Bloc principal, bords haut et gauche plus clairs, bas et droite plus foncés
+        block = canvas.create_rectangle(x1+2, y1+2, x2-2, y2-2, outline="", state=tk.HIDDEN, tags=tag)
+        light = (
+            canvas.create_line(x1+2, y1+2, x2-2, y1+2, width=2, state=tk.HIDDEN, tags=tag),
+            canvas.create_line(x1+2, y1+2, x1+2, y2-2, width=2, state=tk.HIDDEN, tags=tag),
+        )
+        dark = (
+            canvas.create_line(x1+2, y2-2, x2-2, y2-2, width=2, state=tk.HIDDEN, tags=tag),
+            canvas.create_line(x2-2, y1+2, x2-2, y2-2, width=2, state=tk.HIDDEN, tags=tag),
+        )
+        instrument.count('canvas_items_created', len(empty) + 1 + len(light) + len(dark))
+        return empty, block, light, dark
+
+    def set_cell(self, row, col, color):
+        """Affiche une case vide (color=None) ou un bloc, si son apparence a changé"""
+        previous = self.colors[row][col]
+        if previous == color:
+            return
+        self.colors[row][col] = color
+
+        canvas = self.canvas
+        empty, block, light, dark = self.items[row][col]
+        if color is None:
+            for item in (block,) + light + dark:
+                canvas.itemconfig(item, state=tk.HIDDEN)
+            for item in empty:
+                canvas.itemconfig(item, state=tk.NORMAL)
+            return
+
+        if previous is None:
+            for item in empty:
+                canvas.itemconfig(item, state=tk.HIDDEN)
+
+        # Effet 3D: côtés plus foncés
+        lighter_color, darker_color = shades(color)
+        canvas.itemconfig(block, fill=color, state=tk.NORMAL)
+        for item in light:
+            canvas.itemconfig(item, fill=lighter_color, state=tk.NORMAL)
+        for item in dark:
+            canvas.itemconfig(item, fill=darker_color, state=tk.NORMAL)
+
+    def cell_color(self, value, row, col, rainbow, now):
+        """Couleur d'un bloc placé"""
+        if isinstance(value, str) and value in COLORS:
+            return COLORS[value]
+        if rainbow:
+            # En mode arc-en-ciel, utiliser des couleurs alternées
+            return self.rainbow_colors[(row + col + int(now * 5)) % len(self.rainbow_colors)]
+        return BLOCK_COLOR
+
+    def shift_rows(self, cleared_rows):
+        """Rejoue un effacement de lignes en déplaçant les éléments existants.
+
+        Les lignes au-dessus des lignes effacées descendent, et les éléments
+        des lignes effacées remontent en haut pour servir aux nouvelles lignes
+        vides (redessinées ensuite comme cases modifiées).
+        """
+        cleared = set(cleared_rows)
+        order = list(cleared_rows) + [row for row in range(GRID_HEIGHT) if row not in cleared]
+        for new_row, old_row in enumerate(order):
+            if new_row != old_row:
+                self.canvas.move(self.row_tags[old_row], 0, (new_row - old_row) * self.cell_size)
+
+        self.items = [self.items[row] for row in order]
+        self.colors = [self.colors[row] for row in order]
+        self.row_tags = [self.row_tags[row] for row in order]
+
+    @instrument.timed('render')
+    def render(self, player, rainbow=False, now=None):
+        """Met à jour l'affichage des cases modifiées d'un joueur (grille et pièce actuelle)"""
+        if now is None:
+            now = time.time()
+
+        full, shifts, cells = player.changes.take()
+
+        # Les couleurs arc-en-ciel changent avec le temps : tout comparer tant qu'elles sont affichées
+        if full or rainbow or self.rainbow:
+            cells = [(row, col) for row in range(GRID_HEIGHT) for col in range(GRID_WIDTH)]
+        else:
+            for cleared_rows in shifts:
+                self.shift_rows(cleared_rows)
+        self.rainbow = rainbow
+
+        # Cases couvertes par la pièce actuelle
+        piece_cells = {}
+        piece = player.current_piece
+        if piece:
+            if rainbow:
+                piece_color = self.rainbow_colors[int(now * 10) % len(self.rainbow_colors)]
+            else:
+                piece_color = piece.color
+
+            shape = piece.shape.rotations[player.rotation % piece.shape.count]
+            for x, y in shape.cells:
+                piece_cells[(player.position[0] + x, player.position[1] + y)] = piece_color
+
+        # Seules les cases modifiées touchent au canvas ; la pièce passe par-dessus la grille
+        grid = player.board.cells
+        for row, col in cells:
+            color = piece_cells.get((row, col))
+            if color is None and grid[row][col] != 0:
+                color = self.cell_color(grid[row][col], row, col, rainbow, now)
+            self.set_cell(row, col, color)
@@ -0,0 +1,272 @@
+"""Enregistrement compact des parties et rejeu rapide sans interface.
+
+Exemple : python replay.py parties/*.ttr --move 200 --boards
+
+Un enregistrement contient la graine de la partie puis, pas par pas, les
+actions des deux joueurs qui ont eu un effet (entrées, coups de l'IA,
+gravité). Le rejeu recrée le moteur à partir de la graine et rejoue ces
+actions sans relancer la recherche de l'IA : la partie est reproduite à
+l'identique, aussi vite que le moteur le permet.
+
+Format (petit-boutiste) : en-tête de 16 octets (signature, version, options,
+durée d'un pas en ms, graine), puis une entrée par action : écart en pas
+depuis l'action précédente (entier de longueur variable) et un octet
+joueur/action. Une entrée de fin donne le nombre total de pas.
+"""
+import argparse
+import copy
+import json
+import struct
+import sys
+
+from constants import PlayerType, GRID_WIDTH
+from engine import Action, TetrisEngine
+from scheduler import SPECIAL_EVENTS_PERIOD, TICK_MS
+
+# En-tête : signature, version, options (bit 0 : sacs de 7), durée d'un pas (ms), graine
+MAGIC = b'TTRP'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHq')
+FLAG_BAG = 1
+
+# Octet de chaque (joueur, action) et octet de fin d'enregistrement
+ACTION_CODES = {
+    (player_type, action): player_type.value << 3 | action.value
+    for player_type in PlayerType for action in Action
+}
+DECODED_ACTIONS = {code: key for key, code in ACTION_CODES.items()}
+END = 0xFF
+
+# Taille des blocs lus d'un coup dans le flux
+READ_CHUNK = 1 << 16
+
+# Nombre d'actions rejouées entre deux instantanés du moteur
+SNAPSHOT_INTERVAL = 1000
+
+class RecordingWriter:
+    """Écriture au fil de l'eau d'une partie dans un flux binaire.
+
+    S'utilise avec `GameLoop(recorder=...)`, qui appelle `record` pour chaque
+    action ayant eu un effet ; `close` écrit la fin de l'enregistrement sans
+    fermer le flux.
+    """
+    def __init__(self, stream, seed, bag=False, tick_ms=TICK_MS):
+        if seed is None:
+            raise ValueError("Une partie enregistrée doit avoir une graine")
+        self.stream = stream
+        self.tick = 0
+        self.count = 0
+        stream.write(HEADER.pack(MAGIC, VERSION, FLAG_BAG if bag else 0, tick_ms, seed))
+
+    def record(self, tick, player_type, action):
+        """Ajoute une action jouée au pas `tick`"""
+        self.write(tick, ACTION_CODES[player_type, action])
+        self.count += 1
+
+    def close(self, tick):
+        """Termine l'enregistrement avec le nombre total de pas joués"""
+        self.write(tick, END)
+        self.stream.flush()
+
+    def write(self, tick, code):
+        """Écrit l'écart depuis l'entrée précédente puis l'octet de l'entrée"""
+        delta, self.tick = tick - self.tick, tick
+        data = bytearray()
+        while delta >= 0x80:
+            data.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        data.append(delta)
+        data.append(code)
+        self.stream.write(data)
+
+def _read_bytes(stream):
+    """Octets d'un flux, lus par blocs"""
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            return
+        yield from chunk
+
+class RecordingReader:
+    """Lecture au fil de l'eau d'un enregistrement.
+
+    L'en-tête est lu à la création ; l'itération donne les actions
+    (pas, joueur, action) dans l'ordre où elles ont été jouées. Un
+    enregistrement interrompu (partie fermée en cours) se lit jusqu'à sa
+    dernière action complète, et `ticks` reste alors à None.
+    """
+    def __init__(self, stream):
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Enregistrement tronqué")
+        magic, version, flags, self.tick_ms, self.seed = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Format d'enregistrement inconnu")
+        self.bag = bool(flags & FLAG_BAG)
+        self.stream = stream
+
+        # Nombre total de pas, connu une fois l'entrée de fin lue
+        self.ticks = None
+
+    def __iter__(self):
+        data = _read_bytes(self.stream)
+        tick = 0
+        for byte in data:
+            # Écart en pas, 7 bits par octet
+            delta, shift = byte & 0x7F, 7
+            while byte & 0x80:
+                byte = next(data, None)
+                if byte is None:
+                    return
+                delta |= (byte & 0x7F) << shift
+                shift += 7
+
+            code = next(data, None)
+            if code is None:
+                return
+            tick += delta
+            if code == END:
+                self.ticks = tick
+                return
+            if code not in DECODED_ACTIONS:
+                raise ValueError(f"Action inconnue dans l'enregistrement : {code}")
+            yield (tick,) + DECODED_ACTIONS[code]
+
+class Replay:
+    """Rejoue une partie enregistrée sur un moteur sans interface.
+
+    Chaque action est rejouée au pas où elle a eu lieu, avec les événements
+    spéciaux de la boucle de jeu ; la recherche de l'IA n'est jamais
+    relancée. Un instantané du moteur est gardé toutes les
+    `snapshot_interval` actions (None : aucun) pour aller directement à
+    n'importe quelle action avec `seek`.
+    """
+    def __init__(self, seed, actions, bag=False, tick_ms=TICK_MS, ticks=None,
+                 snapshot_interval=SNAPSHOT_INTERVAL):
+        self.seed = seed
+        self.bag = bag
+        self.tick_ms = tick_ms
+        self.actions = list(actions)
+        self.total_ticks = ticks
+        self.snapshot_interval = snapshot_interval
+
+        # Instantanés (pas, moteur) indexés par nombre d'actions rejouées
+        self.snapshots = {}
+        self.reset()
+
+    @classmethod
+    def load(cls, path, snapshot_interval=SNAPSHOT_INTERVAL):
+        """Lit un fichier d'enregistrement"""
+        with open(path, 'rb') as f:
+            reader = RecordingReader(f)
+            actions = list(reader)
+        return cls(reader.seed, actions, reader.bag, reader.tick_ms, reader.ticks, snapshot_interval)
+
+    def time(self):
+        """Temps logique (s) de la partie rejouée, comme celui de `GameLoop`"""
+        return self.ticks * self.tick_ms / 1000
+
+    def reset(self):
+        """Revient au début de la partie (les instantanés sont conservés)"""
+        self.ticks = 0
+        self.move = 0
+        self.finished = False
+        self.engine = TetrisEngine(clock=self.time, seed=self.seed, bag=self.bag)
+        self.engine.start_time = 0
+        self.engine.start()
+
+    def end_tick(self):
+        """Fin du pas en cours : événements spéciaux, aux mêmes pas que la boucle de jeu"""
+        if self.ticks and (self.ticks * self.tick_ms) % SPECIAL_EVENTS_PERIOD == 0:
+            self.engine.update_special_events()
+
+    def advance_to(self, tick):
+        """Termine les pas jusqu'au pas `tick`, dont les actions restent à jouer"""
+        while self.ticks < tick:
+            self.end_tick()
+            self.ticks += 1
+
+    def play(self, move=None):
+        """Rejoue les actions jusqu'à la `move`-ième exclue, ou toute la partie"""
+        end = len(self.actions) if move is None else min(move, len(self.actions))
+        step = self.engine.step
+        while self.move < end:
+            tick, player_type, action = self.actions[self.move]
+            self.advance_to(tick)
+            step(player_type, action)
+            self.move += 1
+            if self.snapshot_interval and self.move % self.snapshot_interval == 0 and self.move not in self.snapshots:
+                self.snapshots[self.move] = self.snapshot()
+
+        # Toute la partie : terminer son dernier pas
+        if move is None and not self.finished:
+            if self.total_ticks is not None:
+                self.advance_to(self.total_ticks)
+            self.end_tick()
+            self.finished = True
+        return self.engine
+
+    def seek(self, move):
+        """Place le rejeu juste après les `move` premières actions, depuis l'instantané le plus proche"""
+        if move < self.move or self.finished:
+            self.reset()
+        start = max((index for index in self.snapshots if self.move < index <= move), default=None)
+        if start is not None:
+            self.restore(start)
+        return self.play(move)
+
+    def snapshot(self):
+        """Copie de l'état du rejeu ; le moteur copié garde l'horloge du rejeu"""
+        clock = self.engine.clock
+        return self.ticks, copy.deepcopy(self.engine, {id(clock): clock})
+
+    def restore(self, move):
+        """Reprend le rejeu à l'instantané pris après `move` actions"""
+        self.ticks, engine = self.snapshots[move]
+        self.engine = copy.deepcopy(engine, {id(engine.clock): engine.clock})
+        self.move = move
+        self.finished = False
+
+    def summary(self, boards=False):
+        """État de la partie rejouée, au format des résultats de `selfplay.py`"""
+        engine = self.engine
+        result = {
+            'seed': self.seed,
+            'move': self.move,
+            'moves': len(self.actions),
+            'winner': engine.winner.name if engine.winner else None,
+            'survival_time': engine.elapsed(),
+        }
+        for player_type, player in engine.players.items():
+            result[player_type.name.lower()] = {
+                'score': player.score,
+                'lines': player.lines,
+                'pieces': player.pieces,
+            }
+            if boards:
+                result[player_type.name.lower()]['board'] = [
+                    ''.join('#' if mask >> col & 1 else '.' for col in range(GRID_WIDTH))
+                    for mask in player.board.rows
+                ]
+        return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rejeu de parties enregistrées, sans interface")
+    parser.add_argument('recordings', nargs='+', help="fichiers d'enregistrement")
+    parser.add_argument('--move', type=int, default=None, help="s'arrêter après cette action (défaut : fin de partie)")
+    parser.add_argument('--boards', action='store_true', help="ajouter les grilles au résultat")
+    args = parser.parse_args(argv)
+
+    for path in args.recordings:
+        # Un rejeu complet se fait d'une traite, sans instantanés
+        replay = Replay.load(path, snapshot_interval=None)
+        if args.move is None:
+            replay.play()
+        else:
+            replay.seek(args.move)
+        result = replay.summary(args.boards)
+        result['recording'] = path
+        sys.stdout.write(json.dumps(result) + '\n')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from collections import deque
+
+import instrument
+from ai import move_actions
+from constants import PlayerType
+from engine import Action
+
+# Durée (ms) d'un pas logique de la boucle de jeu
+TICK_MS = 10
+
+# Délais (ms) avant la recherche de l'IA et entre deux actions de son glissement
+AI_THINK_DELAY = 100
+AI_ACTION_DELAY = 10
+
+# Période (ms) de vérification des événements spéciaux (mode ralenti, arc-en-ciel)
+SPECIAL_EVENTS_PERIOD = 100
+
+# Phases du tour de l'IA
+AI_WAITING = 'waiting'    # Pièce apparue, recherche pas encore lancée
+AI_THINKING = 'thinking'  # Recherche en cours sur un autre thread
+AI_SLIDING = 'sliding'    # Rotations et déplacements du coup choisi
+AI_FALLING = 'falling'    # Chute par gravité jusqu'à la pose
+
+class AITurn:
+    """État du tour d'un joueur joué par l'IA"""
+    def __init__(self):
+        self.phase = AI_WAITING
+        self.wait = AI_THINK_DELAY
+        self.future = None
+        self.actions = []
+
+class GameLoop:
+    """Boucle de jeu à pas fixe qui remplace les chaînes de timers par joueur.
+
+    Chaque appel à `tick` avance la partie de `tick_ms` millisecondes
+    logiques : entrées en attente, tours de l'IA, gravité des deux joueurs
+    puis événements spéciaux. Le moteur suit ce temps logique, ce qui rend
+    une partie reproductible tant que la recherche de l'IA est jouée dans le
+    pas (sans `executor`) et sans temps de réflexion limité (`time_budget`,
+    qui fait dépendre le coup du temps réel : seul un enregistrement permet
+    alors de rejouer la partie). Avec un `executor`, la recherche tourne à côté et
+    l'IA attend son résultat sans bloquer la boucle. `ai_players` indique
+    les joueurs joués par l'IA (les deux pour une partie IA contre IA).
+    Un `recorder` (voir `replay.RecordingWriter`) reçoit chaque action
+    ayant eu un effet, avec son pas, pour rejouer la partie plus tard.
+    """
+    def __init__(self, engine, ai=None, executor=None, tick_ms=TICK_MS, ai_players=(PlayerType.AI,),
+                 recorder=None):
+        self.engine = engine
+        self.ai = ai
+        self.executor = executor
+        self.tick_ms = tick_ms
+        self.recorder = recorder
+        self.ticks = 0
+
+        # Le moteur mesure le temps de la partie en pas logiques
+        self.engine.clock = self.time
+        self.engine.start_time = 0
+
+        # Temps restant (ms) avant la prochaine descente de chaque joueur
+        self.gravity = {player_type: 0 for player_type in engine.players}
+
+        # Entrées des joueurs humains, appliquées au début du pas suivant
+        self.inputs = deque()
+
+        # Tour de chaque joueur joué par l'IA
+        self.turns = {player_type: AITurn() for player_type in ai_players} if ai is not None else {}
+
+    def time(self):
+        """Temps logique (s) écoulé depuis le début de la boucle"""
+        return self.ticks * self.tick_ms / 1000
+
+    def start(self):
+        """Fait apparaître les premières pièces et arme les timers des deux joueurs"""
+        self.engine.start()
+        for player_type in self.engine.players:
+            self.on_piece_spawned(player_type)
+
+    def queue(self, player_type, action):
+        """Enregistre une action d'un joueur pour le prochain pas"""
+        self.inputs.append((player_type, action))
+
+    @instrument.timed('tick')
+    def tick(self):
+        """Avance la partie d'un pas et renvoie les résultats [(joueur, résultat)] des actions jouées"""
+        events = []
+        if self.engine.game_over:
+            return events
+
+        self.ticks += 1
+
+        # Entrées des joueurs ; descendre à la main relance le timer de gravité
+        while self.inputs:
+            player_type, action = self.inputs.popleft()
+            result = self.apply(player_type, action, events)
+            if action == Action.DOWN and not result['locked']:
+                self.gravity[player_type] = self.engine.players[player_type].speed
+
+        for player_type, turn in self.turns.items():
+            self.advance_ai(player_type, turn, events)
+
+        # Gravité ; une pièce de l'IA ne tombe qu'une fois son coup joué
+        for player_type, player in self.engine.players.items():
+            turn = self.turns.get(player_type)
+            if turn is not None and turn.phase != AI_FALLING:
+                continue
+            self.gravity[player_type] -= self.tick_ms
+            if self.gravity[player_type] <= 0:
+                self.gravity[player_type] = player.speed
+                self.apply(player_type, Action.DOWN, events)
+
+        if (self.ticks * self.tick_ms) % SPECIAL_EVENTS_PERIOD == 0:
+            self.engine.update_special_events()
+
+        return events
+
+    def apply(self, player_type, action, events):
+        """Joue une action dans le moteur et note son résultat s'il s'est passé quelque chose"""
+        result = self.engine.step(player_type, action)
+        if result['moved'] or result['locked']:
+            events.append((player_type, result))
+            if self.recorder is not None:
+                self.recorder.record(self.ticks, player_type, action)
+        if result['locked']:
+            self.on_piece_spawned(player_type)
+        return result
+
+    def on_piece_spawned(self, player_type):
+        """Réarme la gravité et, pour l'IA, relance son tour après l'apparition d'une pièce"""
+        self.gravity[player_type] = self.engine.players[player_type].speed
+        if player_type in self.turns:
+            self.turns[player_type] = AITurn()
+
+    def advance_ai(self, player_type, turn, events):
+        """Avance le tour de l'IA d'un pas : attente, recherche, glissement"""
+        if turn.phase == AI_WAITING:
+            turn.wait -= self.tick_ms
+            if turn.wait > 0:
+                return
+            if self.executor is None:
+                self.start_slide(player_type, turn, self.ai.choose_move(self.engine, player_type), events)
+            else:
+                # La copie est prise ici : le cadeau surprise peut changer la pièce suivante pendant la recherche
+                position = self.ai.snapshot(self.engine, player_type)
+                turn.future = self.executor.submit(self.ai.choose_move_from, position)
+                turn.phase = AI_THINKING
+
+        elif turn.phase == AI_THINKING:
+            if not turn.future.done():
+                return
+            future, turn.future = turn.future, None
+            try:
+                best_move = future.result()
+            except Exception as e:
+                print(f"Erreur dans la recherche de l'IA: {e}")
+                # En cas d'erreur, continuer le jeu
+                best_move = None
+            self.start_slide(player_type, turn, best_move, events)
+
+        elif turn.phase == AI_SLIDING:
+            turn.wait -= self.tick_ms
+            if turn.wait <= 0:
+                self.slide_step(player_type, turn, events)
+
+    def start_slide(self, player_type, turn, best_move, events):
+        """Prépare les rotations puis déplacements du coup choisi et joue le premier"""
+        turn.actions = move_actions(self.engine, player_type, best_move) if best_move else []
+        turn.phase = AI_SLIDING
+        self.slide_step(player_type, turn, events)
+
+    def slide_step(self, player_type, turn, events):
+        """Joue une action du glissement de l'IA, puis la laisse tomber quand il est fini"""
+        while turn.actions:
+            action = turn.actions.pop(0)
+            if self.apply(player_type, action, events)['moved']:
+                turn.wait = AI_ACTION_DELAY
+                return
+            if action != Action.ROTATE:
+                # Déplacement bloqué : abandonner le reste du glissement
+                turn.actions = []
+
+        turn.phase = AI_FALLING
+        self.gravity[player_type] = self.engine.players[player_type].speed
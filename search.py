@@ -0,0 +1,347 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_eval
+import instrument
+from board import board_hash, make_move, unmake_move
+from cache import MISSING, LRUCache
+from constants import GRID_WIDTH, STANDARD_SHAPES, AI_DEPTH
+from evaluator import Evaluator
+from features import BoardFeatures
+from shapes import SHAPE_REGISTRY
+
+class SearchTimeout(Exception):
+    """Le temps de réflexion accordé à un coup est écoulé"""
+
+# Moteur de recherche de chaque processus de calcul (ses caches durent d'un tour à l'autre)
+_worker_search = None
+
+def _init_worker(depth, beam_width, lookahead_weight, evaluator, vectorized):
+    """Crée le moteur de recherche d'un processus de calcul"""
+    global _worker_search
+    _worker_search = SearchEngine(depth, beam_width, lookahead_weight, evaluator=evaluator, vectorized=vectorized)
+
+def _evaluate_subtrees(subtrees):
+    """Valeurs de sous-arbres [(grille, caractéristiques, hachage, pièces, profondeur)] dans un processus de calcul"""
+    _worker_search.nodes = 0
+    _worker_search.table_hits = 0
+    # Les sous-arbres d'une même recherche ont les mêmes pièces et la même profondeur
+    _, _, _, known, depth = subtrees[0]
+    if _worker_search.vectorized and depth == 1:
+        values = _worker_search.leaf_values([(rows, zhash) for rows, _, zhash, _, _ in subtrees], known)
+    else:
+        values = [_worker_search.value(rows, features, zhash, known, depth)
+                  for rows, features, zhash, known, depth in subtrees]
+    return values, _worker_search.nodes, _worker_search.table_hits
+
+class SearchEngine:
+    """Recherche du meilleur coup sur N pièces avec faisceau et table de transposition.
+
+    Chaque niveau essaie toutes les rotations et toutes les colonnes, garde
+    les `beam_width` meilleures poses (toutes si None) et les approfondit.
+    Au-delà des pièces connues, la valeur est la moyenne sur les pièces
+    standard. Les grilles sont identifiées par leur hachage de Zobrist : les
+    grilles identiques obtenues par des coups différents ne sont évaluées
+    qu'une fois grâce à la table de transposition.
+
+    Avec `workers` > 1, les sous-arbres des coups de la racine sont répartis
+    sur un groupe de processus. La table n'est pas partagée : chaque processus
+    a sa propre table, qui dure d'une recherche à l'autre, et ne réutilise pas
+    les sous-arbres des autres. Seule la table du processus principal fait le
+    lien : les racines de sous-arbres qu'elle connaît déjà ne sont pas
+    envoyées, et les valeurs renvoyées par les processus y sont ajoutées. En
+    cas d'échec du groupe, la recherche repasse en série. La recherche
+    répartie ne s'approfondit pas niveau par niveau : `workers` > 1 et
+    `time_budget` ne peuvent pas être combinés.
+
+    Avec `time_budget` (ms), la recherche s'approfondit d'un niveau à la fois
+    jusqu'à `depth` et renvoie le meilleur coup du dernier niveau terminé
+    quand le temps est écoulé ; le niveau 1 est toujours terminé.
+
+    Toutes les poses, à tous les niveaux, sont notées par le même
+    `evaluator` (poids par défaut si None). Avec `vectorized`, les poses du
+    dernier niveau sont notées en lots NumPy (voir `batch_eval`), avec
+    exactement les mêmes scores ; l'option est ignorée si NumPy est absent.
+    """
+    def __init__(self, depth=AI_DEPTH, beam_width=None, lookahead_weight=0.5,
+                 table_size=20000, workers=1, time_budget=None, evaluator=None, vectorized=False):
+        if workers > 1 and time_budget is not None:
+            raise ValueError("La recherche répartie (workers > 1) ne prend pas en charge time_budget")
+        self.depth = depth
+        self.beam_width = beam_width
+        self.lookahead_weight = lookahead_weight  # Importance de chaque niveau suivant
+        self.evaluator = evaluator or Evaluator()
+        self.vectorized = vectorized and batch_eval.numpy_available()
+
+        # Temps de réflexion par coup (ms), None pour une recherche à profondeur fixe
+        self.time_budget = time_budget
+        self.deadline = None
+
+        # Processus de calcul des sous-arbres de la racine (créés à la première recherche)
+        self.workers = workers
+        self.pool = None
+
+        # Table de transposition : (hachage, pièces connues, profondeur) -> valeur
+        self.table = LRUCache(table_size)
+
+        # Statistiques de la dernière recherche
+        self.nodes = 0
+        self.table_hits = 0
+        self.depth_reached = 0
+        self.timed_out = False
+        self.elapsed_ms = 0.0
+
+    @instrument.timed('search')
+    def best_move(self, rows, piece_types, features=None, zhash=None):
+        """Meilleur coup pour piece_types[0], les pièces suivantes connues étant piece_types[1:].
+
+        Le coup renvoyé indique aussi la profondeur atteinte ('depth') et le
+        nombre de poses évaluées ('nodes').
+        """
+        started = time.perf_counter()
+        self.nodes = 0
+        self.table_hits = 0
+        self.timed_out = False
+        if features is None:
+            features = BoardFeatures(rows)
+        if zhash is None:
+            zhash = board_hash(rows)
+
+        if self.time_budget is None:
+            best = self.search_depth(rows, piece_types, features, zhash, self.depth)
+            self.depth_reached = self.depth
+        else:
+            # Approfondissement itératif : l'échéance ne s'applique qu'après le niveau 1
+            best = None
+            self.depth_reached = 0
+            for depth in range(1, self.depth + 1):
+                try:
+                    best = self.search_depth(rows, piece_types, features, zhash, depth)
+                except SearchTimeout:
+                    self.timed_out = True
+                    break
+                self.depth_reached = depth
+                self.deadline = started + self.time_budget / 1000
+            self.deadline = None
+
+        self.elapsed_ms = (time.perf_counter() - started) * 1000
+        instrument.count('search_nodes', self.nodes)
+        instrument.count('table_hits', self.table_hits)
+        instrument.count('searches')
+        instrument.count('search_depth', self.depth_reached)
+        if self.timed_out:
+            instrument.count('search_timeouts')
+        if best is None:
+            best = (0, GRID_WIDTH // 2 - 1)
+        return {'rotation': best[0], 'column': best[1], 'depth': self.depth_reached, 'nodes': self.nodes}
+
+    def search_depth(self, rows, piece_types, features, zhash, depth):
+        """Meilleur (rotation, colonne) d'une recherche complète sur `depth` niveaux"""
+        # Copies de travail uniques : les coups y sont joués puis annulés sur place
+        rows = list(rows)
+        features = features.copy()
+
+        known = tuple(piece_types[:depth])
+        if self.workers > 1 and depth > 1:
+            return self.search_parallel(rows, features, zhash, known, depth)[1]
+        return self.search(rows, features, zhash, known, depth)[1]
+
+    def stats(self):
+        """Compteurs de la dernière recherche et des caches"""
+        return {
+            'nodes': self.nodes,
+            'table_hits': self.table_hits,
+            'depth_reached': self.depth_reached,
+            'timed_out': self.timed_out,
+            'elapsed_ms': self.elapsed_ms,
+            'table': self.table.stats(),
+        }
+
+    @instrument.timed('evaluate')
+    def evaluate(self, rows, features, piece_type, shape, column):
+        """(score, ligne d'arrivée) d'une pose de la rotation `shape`, ou None si la pièce ne rentre pas"""
+        placed = features.placement(rows, shape, column, self.evaluator.surface)
+        if placed is None:
+            return None
+        return self.evaluator.score(placed, piece_type), placed['landing_row']
+
+    def candidates(self, rows, features, piece_type):
+        """Toutes les poses possibles (score, rotation, colonne, ligne d'arrivée) d'une pièce"""
+        candidates = []
+        for rotation, shape in enumerate(SHAPE_REGISTRY[piece_type].rotations):
+            for column in shape.positions:
+                evaluated = self.evaluate(rows, features, piece_type, shape, column)
+                if evaluated is None:
+                    continue
+                self.nodes += 1
+                candidates.append((evaluated[0], rotation, column, evaluated[1]))
+        return candidates
+
+    def beam(self, candidates):
+        """Meilleures poses à approfondir, de la meilleure à la moins bonne"""
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        if self.beam_width:
+            candidates = candidates[:self.beam_width]
+        return candidates
+
+    def search(self, rows, features, zhash, known, depth):
+        """Meilleur (score, (rotation, colonne)) pour la pièce known[0] avec `depth` niveaux"""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        piece_type = known[0]
+
+        # Évaluer toutes les poses possibles de la pièce
+        candidates = self.candidates(rows, features, piece_type)
+        if not candidates:
+            return float('-inf'), None
+
+        if depth == 1:
+            score, rotation, column, _ = max(candidates, key=lambda candidate: candidate[0])
+            return score, (rotation, column)
+
+        # Ne garder que les meilleures poses pour le niveau suivant
+        candidates = self.beam(candidates)
+
+        rotations = SHAPE_REGISTRY[piece_type].rotations
+        futures = None
+        if self.vectorized and depth == 2:
+            # Dernier niveau : les grilles filles sont toutes notées en un lot
+            children = []
+            for score, rotation, column, row in candidates:
+                child_rows = list(rows)
+                children.append((child_rows, make_move(child_rows, rotations[rotation], (row, column), None, zhash)[-1]))
+            futures = self.leaf_values(children, known[1:])
+
+        # Sans avenir viable, le meilleur coup immédiat reste le choix par défaut
+        best_score = float('-inf')
+        best_move = candidates[0][1:3]
+        for index, (score, rotation, column, row) in enumerate(candidates):
+            if futures is not None:
+                future = futures[index]
+            else:
+                snapshot = features.snapshot()
+                undo = make_move(rows, rotations[rotation], (row, column), features, zhash)
+                future = self.value(rows, features, undo[-1], known[1:], depth - 1)
+                unmake_move(rows, undo)
+                features.restore(snapshot)
+
+            total = score + future * self.lookahead_weight
+            if total > best_score:
+                best_score = total
+                best_move = (rotation, column)
+
+        return best_score, best_move
+
+    def search_parallel(self, rows, features, zhash, known, depth):
+        """Comme `search`, avec les sous-arbres de la racine répartis sur les processus de calcul"""
+        piece_type = known[0]
+        candidates = self.candidates(rows, features, piece_type)
+        if not candidates:
+            return float('-inf'), None
+        candidates = self.beam(candidates)
+
+        # Jouer chaque coup de la racine sur une copie ; les valeurs déjà connues ne partent pas
+        values = [None] * len(candidates)
+        pending = []
+        rotations = SHAPE_REGISTRY[piece_type].rotations
+        for index, (score, rotation, column, row) in enumerate(candidates):
+            child_rows = list(rows)
+            child_features = features.copy()
+            child_hash = make_move(child_rows, rotations[rotation], (row, column), child_features, zhash)[-1]
+            key = (child_hash, known[1:], depth - 1)
+            value = self.table.get(key)
+            if value is not MISSING:
+                self.table_hits += 1
+                values[index] = value
+            else:
+                pending.append((index, key, (child_rows, child_features, child_hash, known[1:], depth - 1)))
+
+        # Un lot de sous-arbres par processus limite les échanges
+        batches = [pending[start::self.workers] for start in range(self.workers)]
+        batches = [batch for batch in batches if batch]
+        try:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                initargs=(self.depth, self.beam_width, self.lookahead_weight,
+                                                          self.evaluator, self.vectorized))
+            futures = [self.pool.submit(_evaluate_subtrees, [subtree for _, _, subtree in batch])
+                       for batch in batches]
+            results = [future.result() for future in futures]
+        except (OSError, RuntimeError) as e:
+            print(f"Recherche parallèle indisponible, retour à la recherche en série: {e}")
+            self.close()
+            self.workers = 1
+            return self.search(rows, features, zhash, known, depth)
+
+        for batch, (batch_values, nodes, table_hits) in zip(batches, results):
+            self.nodes += nodes
+            self.table_hits += table_hits
+            for (index, key, _), value in zip(batch, batch_values):
+                self.table.put(key, value)
+                values[index] = value
+
+        # Même réduction que la recherche en série : le premier meilleur coup l'emporte
+        best_score = float('-inf')
+        best_move = candidates[0][1:3]
+        for (score, rotation, column, _), future in zip(candidates, values):
+            total = score + future * self.lookahead_weight
+            if total > best_score:
+                best_score = total
+                best_move = (rotation, column)
+
+        return best_score, best_move
+
+    def close(self):
+        """Arrête les processus de calcul"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def value(self, rows, features, zhash, known, depth):
+        """Valeur d'une grille avant de poser la pièce suivante (espérance si elle est inconnue)"""
+        key = (zhash, known, depth)
+        value = self.table.get(key)
+        if value is not MISSING:
+            self.table_hits += 1
+            return value
+
+        if known:
+            value = self.search(rows, features, zhash, known, depth)[0]
+        else:
+            value = 0
+            for piece_type in STANDARD_SHAPES:
+                value += self.search(rows, features, zhash, (piece_type,), depth)[0]
+            value /= len(STANDARD_SHAPES)
+
+        self.table.put(key, value)
+        return value
+
+    def leaf_values(self, children, known):
+        """Comme `value` au dernier niveau, pour des grilles [(masques, hachage)] notées en un lot NumPy"""
+        values = [None] * len(children)
+        pending = []
+        for index, (_, zhash) in enumerate(children):
+            value = self.table.get((zhash, known, 1))
+            if value is not MISSING:
+                self.table_hits += 1
+                values[index] = value
+            else:
+                pending.append(index)
+        if not pending:
+            return values
+
+        # Même somme, dans le même ordre, que `value` et `search` en Python
+        boards = batch_eval.rows_to_boards([children[index][0] for index in pending])
+        totals = [0] * len(pending)
+        for piece_type in known or STANDARD_SHAPES:
+            scores, nodes = batch_eval.best_scores(boards, piece_type, self.evaluator)
+            self.nodes += nodes
+            for i, score in enumerate(scores.tolist()):
+                totals[i] += score
+
+        for index, total in zip(pending, totals):
+            value = total if known else total / len(STANDARD_SHAPES)
+            self.table.put((children[index][1], known, 1), value)
+            values[index] = value
+        return values
@@ -0,0 +1,134 @@
+"""Parties IA contre IA en lot, sans interface, réparties sur plusieurs processus.
+
+Exemple : python selfplay.py --games 1000 --workers 64 --max-pieces 500 --output resultats.jsonl
+
+Chaque partie est rejouable à l'identique à partir de sa graine, sauf avec
+--time-budget : le coup choisi dépend alors du temps de calcul, et seul
+--record permet de rejouer la partie. Les résultats sont écrits au fil de
+l'eau, une ligne JSON par partie. Avec --record, chaque partie est aussi
+enregistrée (`<graine>.ttr`) pour être rejouée par replay.py sans relancer
+l'IA.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from ai import TetrisAI
+from constants import AI_DEPTH
+from engine import TetrisEngine
+from evaluator import Evaluator
+from replay import RecordingWriter
+from scheduler import GameLoop
+
+# IA du processus, réutilisée d'une partie à l'autre pour garder ses caches
+_worker_ai = None
+
+def _init_worker(depth, beam_width, time_budget, evaluator=None):
+    """Crée l'IA de chaque processus de calcul"""
+    global _worker_ai
+    _worker_ai = TetrisAI(depth=depth, beam_width=beam_width, time_budget=time_budget, evaluator=evaluator)
+
+def play_game(seed, max_pieces=None, bag=False, ai=None, record=None):
+    """Joue une partie IA contre IA et renvoie son résultat.
+
+    La partie s'arrête au game over ou dès qu'un joueur a posé `max_pieces`
+    pièces. Le temps de survie est le temps de jeu écoulé, en secondes.
+    Avec `record`, la partie est enregistrée dans ce fichier. La profondeur
+    de recherche atteinte (moyenne et minimum sur les coups de la partie)
+    montre l'effet de --time-budget.
+    """
+    ai = ai or _worker_ai or TetrisAI()
+    ai.depth_counts.clear()
+    engine = TetrisEngine(seed=seed, bag=bag)
+    recording = open(record, 'wb') if record else None
+    recorder = RecordingWriter(recording, seed, bag) if recording else None
+    loop = GameLoop(engine, ai, ai_players=tuple(engine.players), recorder=recorder)
+
+    started = time.perf_counter()
+    try:
+        loop.start()
+        while not engine.game_over:
+            loop.tick()
+            if max_pieces and any(player.pieces >= max_pieces for player in engine.players.values()):
+                break
+        if recorder:
+            recorder.close(loop.ticks)
+    finally:
+        if recording:
+            recording.close()
+
+    result = {
+        'seed': seed,
+        'winner': engine.winner.name if engine.winner else None,
+        'survival_time': engine.elapsed(),
+        'wall_time': time.perf_counter() - started,
+        'search_depth': ai.depth_summary(),
+    }
+    for player_type, player in engine.players.items():
+        result[player_type.name.lower()] = {
+            'score': player.score,
+            'lines': player.lines,
+            'pieces': player.pieces,
+        }
+    return result
+
+def _play(args):
+    """Point d'entrée des processus de calcul"""
+    return play_game(*args)
+
+def run_batch(seeds, workers=None, max_pieces=None, bag=False, depth=AI_DEPTH, beam_width=None, output=None,
+              time_budget=None, record=None, evaluator=None):
+    """Joue une partie par graine sur `workers` processus et écrit chaque résultat dès qu'il arrive.
+
+    Avec `record`, chaque partie est enregistrée dans ce dossier. L'IA note
+    ses poses avec `evaluator` (poids par défaut si None).
+    """
+    output = output or sys.stdout
+    if record:
+        os.makedirs(record, exist_ok=True)
+    tasks = [(seed, max_pieces, bag, None, os.path.join(record, f"{seed}.ttr") if record else None)
+             for seed in seeds]
+
+    # Des lots de plusieurs parties par envoi limitent les échanges entre processus
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(tasks) // (workers * 8))
+
+    with Pool(workers, initializer=_init_worker, initargs=(depth, beam_width, time_budget, evaluator)) as pool:
+        for result in pool.imap_unordered(_play, tasks, chunksize):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+
+        # Laisser les processus se terminer normalement (et écrire leurs dernières mesures)
+        pool.close()
+        pool.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parties IA contre IA en lot, sans interface")
+    parser.add_argument('--games', type=int, default=100, help="nombre de parties")
+    parser.add_argument('--seed', type=int, default=0, help="graine de la première partie (les suivantes : +1, +2...)")
+    parser.add_argument('--seeds', type=int, nargs='+', help="graines explicites (remplace --games et --seed)")
+    parser.add_argument('--workers', type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument('--max-pieces', type=int, default=None, help="arrêter une partie quand un joueur a posé autant de pièces")
+    parser.add_argument('--bag', action='store_true', help="distribuer les pièces par sacs de 7")
+    parser.add_argument('--depth', type=int, default=AI_DEPTH, help="profondeur de recherche de l'IA")
+    parser.add_argument('--beam-width', type=int, default=None, help="largeur du faisceau de l'IA")
+    parser.add_argument('--time-budget', type=float, default=None, help="temps de réflexion de l'IA par coup (ms)")
+    parser.add_argument('--output', default='-', help="fichier de résultats JSON lines ('-' : sortie standard)")
+    parser.add_argument('--record', default=None, help="dossier où enregistrer chaque partie pour replay.py")
+    parser.add_argument('--weights', default=None, help="profil JSON des poids de l'évaluateur")
+    args = parser.parse_args(argv)
+
+    seeds = args.seeds or range(args.seed, args.seed + args.games)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        run_batch(seeds, args.workers, args.max_pieces, args.bag, args.depth, args.beam_width, output,
+                  args.time_budget, args.record, Evaluator.load(args.weights) if args.weights else None)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == "__main__":
+    main()
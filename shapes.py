@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+from constants import GRID_WIDTH, COLORS, SHAPES, SPECIAL_SHAPES
+
+# Données précalculées d'une rotation :
+# - cells : cases (ligne, colonne) relatives à la position de la pièce
+# - masks : masque de bits de chaque ligne de la pièce
+# - min_col, max_col : colonnes extrêmes occupées ; width, height : dimensions
+# - skirt : profil inférieur, (colonne, décalage de la case la plus basse)
+# - columns : profil par colonne, (colonne, case la plus haute, nombre de cases)
+# - positions : colonnes où la pièce tient dans la largeur de la grille
+Rotation = namedtuple('Rotation', 'cells masks min_col max_col width height skirt columns positions')
+
+# Forme d'une pièce : ses rotations et leur nombre, sa couleur
+Shape = namedtuple('Shape', 'name color special rotations count')
+
+def _rotation(cells):
+    """Précalcule les données d'une rotation à partir de ses cases"""
+    cells = tuple(cells)
+
+    masks = [0] * (max(x for x, _ in cells) + 1)
+    for x, y in cells:
+        masks[x] |= 1 << y
+
+    min_col = min(y for _, y in cells)
+    max_col = max(y for _, y in cells)
+
+    bottoms = {}
+    for x, y in cells:
+        bottoms[y] = max(bottoms.get(y, 0), x)
+
+    columns = []
+    for y in range(min_col, max_col + 1):
+        offsets = sorted(x for x, column in cells if column == y)
+        if offsets:
+            columns.append((y, offsets[0], len(offsets)))
+
+    return Rotation(
+        cells=cells,
+        masks=tuple(masks),
+        min_col=min_col,
+        max_col=max_col,
+        width=max_col - min_col + 1,
+        height=len(masks),
+        skirt=tuple(sorted(bottoms.items())),
+        columns=tuple(columns),
+        positions=range(-min_col, GRID_WIDTH - max_col),
+    )
+
+# Registre immuable de toutes les formes, calculé une seule fois
+SHAPE_REGISTRY = {
+    name: Shape(
+        name=name,
+        color=COLORS[name],
+        special=name in SPECIAL_SHAPES,
+        rotations=tuple(_rotation(cells) for cells in rotations),
+        count=len(rotations),
+    )
+    for name, rotations in SHAPES.items()
+}
+
+class Piece:
+    """Pièce de jeu : type, forme précalculée et couleur"""
+    __slots__ = ('type', 'shape', 'color')
+
+    def __init__(self, piece_type):
+        self.type = piece_type
+        self.shape = SHAPE_REGISTRY[piece_type]
+        self.color = self.shape.color
+
+    def __repr__(self):
+        return f"Piece({self.type!r})"
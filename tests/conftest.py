@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Les modules du jeu sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import GRID_WIDTH, GRID_HEIGHT  # noqa: E402
+
+FULL_ROW = (1 << GRID_WIDTH) - 1
+
+def random_rows(rng, height, hole_rate):
+    """Grille aléatoire de `height` lignes remplies, avec environ `hole_rate` de cases vides"""
+    rows = [0] * GRID_HEIGHT
+    for row in range(GRID_HEIGHT - height, GRID_HEIGHT):
+        mask = 0
+        for col in range(GRID_WIDTH):
+            if rng.random() >= hole_rate:
+                mask |= 1 << col
+        # Jamais de ligne complète : elle aurait déjà été effacée
+        if mask == FULL_ROW:
+            mask &= ~(1 << rng.randrange(GRID_WIDTH))
+        rows[row] = mask
+    return rows
+
+@pytest.fixture
+def make_rows():
+    """Générateur de grilles aléatoires : make_rows(rng, hauteur, part de cases vides)"""
+    return random_rows
@@ -0,0 +1,43 @@
+"""Recherche avec le dernier niveau noté en lots NumPy, comparée à la recherche en Python"""
+import random
+
+import pytest
+
+from constants import STANDARD_SHAPES
+from evaluator import Evaluator
+from search import SearchEngine
+
+EVALUATORS = [
+    Evaluator(),
+    Evaluator({'transitions': 0, 'bumpiness': 0, 'wells': 0}),
+    Evaluator({'lines_cleared': 40, 'holes': -30, 'wells': 25, 'max_height': -0.5}),
+]
+
+# (profondeur, largeur du faisceau, pièces connues, nombre de grilles)
+SETTINGS = [(2, None, 2, 60), (2, None, 1, 20), (3, 4, 2, 10)]
+
+@pytest.fixture
+def corpus(make_rows):
+    """Grilles fixes, de vides à presque pleines, avec plus ou moins de trous"""
+    rng = random.Random(3)
+    return [make_rows(rng, rng.randrange(0, 17), rng.random() * 0.5) for _ in range(60)]
+
+@pytest.mark.parametrize('evaluator', EVALUATORS, ids=['default', 'no_surface', 'custom'])
+@pytest.mark.parametrize('depth, beam_width, preview, boards', SETTINGS)
+def test_vectorized_search_matches_python_search(corpus, evaluator, depth, beam_width, preview, boards):
+    pytest.importorskip('numpy')
+    python = SearchEngine(depth, beam_width, evaluator=evaluator)
+    vectorized = SearchEngine(depth, beam_width, evaluator=evaluator, vectorized=True)
+    assert vectorized.vectorized
+
+    rng = random.Random(depth * 10 + preview)
+    for rows in corpus[:boards]:
+        piece_types = tuple(rng.choice(STANDARD_SHAPES) for _ in range(preview))
+        expected = python.best_move(rows, piece_types)
+        move = vectorized.best_move(rows, piece_types)
+        assert move == expected
+
+def test_vectorized_is_ignored_without_numpy(monkeypatch):
+    import batch_eval
+    monkeypatch.setattr(batch_eval, 'np', None)
+    assert not SearchEngine(vectorized=True).vectorized
@@ -0,0 +1,66 @@
+"""Journal des cases modifiées : rejoué sur l'affichage précédent, il redonne la grille du moteur"""
+import random
+
+from ai import TetrisAI, move_actions
+from constants import GRID_WIDTH, GRID_HEIGHT
+from engine import Action, ChangeLog, TetrisEngine
+
+def expected_view(player):
+    """Ce que l'affichage doit montrer : la grille, avec la pièce actuelle par-dessus"""
+    view = [row[:] for row in player.board.cells]
+    piece = player.current_piece
+    if piece:
+        shape = piece.shape.rotations[player.rotation % piece.shape.count]
+        for x, y in shape.cells:
+            view[player.position[0] + x][player.position[1] + y] = 'piece'
+    return view
+
+def apply_changes(view, player):
+    """Met à jour l'affichage comme `Renderer.render` : décalages de lignes, puis cases marquées"""
+    full, shifts, cells = player.changes.take()
+    if full:
+        cells = [(row, col) for row in range(GRID_HEIGHT) for col in range(GRID_WIDTH)]
+    else:
+        for cleared_rows in shifts:
+            cleared = set(cleared_rows)
+            order = list(cleared_rows) + [row for row in range(GRID_HEIGHT) if row not in cleared]
+            view[:] = [view[row] for row in order]
+    expected = expected_view(player)
+    for row, col in cells:
+        view[row][col] = expected[row][col]
+
+def test_merged_changes_rebuild_the_board():
+    ai = TetrisAI(depth=1)
+    for seed in range(3):
+        engine = TetrisEngine(seed=seed)
+        engine.start()
+        rng = random.Random(seed)
+        views = {player_type: [[None] * GRID_WIDTH for _ in range(GRID_HEIGHT)] for player_type in engine.players}
+        pending = 0
+        while not engine.game_over and all(player.pieces < 150 for player in engine.players.values()):
+            for player_type in engine.players:
+                actions = move_actions(engine, player_type, ai.choose_move(engine, player_type)) + [Action.DROP]
+                for action in actions:
+                    engine.step(player_type, action)
+                    if engine.game_over:
+                        break
+
+                    # Plusieurs actions, poses et effacements entre deux affichages
+                    pending += 1
+                    if pending >= rng.randrange(1, 12):
+                        pending = 0
+                        for other, player in engine.players.items():
+                            apply_changes(views[other], player)
+                            assert views[other] == expected_view(player)
+        assert all(player.lines > 0 for player in engine.players.values())
+
+def test_too_many_shifts_fall_back_to_full_redraw():
+    changes = ChangeLog()
+    changes.take()
+    for _ in range(GRID_HEIGHT):
+        changes.shift_rows([GRID_HEIGHT - 1])
+    assert not changes.full and len(changes.shifts) == GRID_HEIGHT
+
+    changes.shift_rows([GRID_HEIGHT - 1])
+    full, shifts, cells = changes.take()
+    assert full and not shifts and not cells
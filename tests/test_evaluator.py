@@ -0,0 +1,51 @@
+"""Évaluateur : profils JSON, vecteur de poids et refus des caractéristiques inconnues"""
+import json
+
+import pytest
+
+from evaluator import DEFAULT_WEIGHTS, FEATURES, Evaluator
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'poids.json')
+    evaluator = Evaluator({'holes': -22.5, 'wells': 0})
+    evaluator.save(path, fitness=12.5, generation=3)
+
+    with open(path) as f:
+        profile = json.load(f)
+    assert profile['fitness'] == 12.5 and profile['generation'] == 3
+
+    loaded = Evaluator.load(path)
+    assert loaded.weights == evaluator.weights
+    assert not loaded.well_weight
+
+def test_load_accepts_bare_weights_and_keeps_defaults(tmp_path):
+    path = tmp_path / 'poids.json'
+    path.write_text(json.dumps({'holes': -40}))
+    evaluator = Evaluator.load(str(path))
+    assert evaluator.weights == dict(DEFAULT_WEIGHTS, holes=-40)
+
+def test_vector_round_trip():
+    evaluator = Evaluator({'bumpiness': -2.5, 'lines_cleared': 90})
+    vector = evaluator.vector()
+    assert len(vector) == len(FEATURES)
+    assert Evaluator.from_vector(vector).weights == evaluator.weights
+
+@pytest.mark.parametrize('weights', [{'hole': -15}, {'holes': -15, 'speed': 1}])
+def test_unknown_features_are_rejected(weights):
+    with pytest.raises(ValueError, match='inconnues'):
+        Evaluator(weights)
+
+def test_bad_profile_is_rejected(tmp_path):
+    path = tmp_path / 'poids.json'
+    path.write_text(json.dumps({'weights': {'height': -1}}))
+    with pytest.raises(ValueError):
+        Evaluator.load(str(path))
+
+    path.write_text('{"weights": ')
+    with pytest.raises(ValueError):
+        Evaluator.load(str(path))
+
+def test_zero_surface_weights_skip_surface_features():
+    evaluator = Evaluator({'transitions': 0, 'bumpiness': 0, 'wells': 0})
+    assert not evaluator.surface
+    assert [name for name, _ in evaluator.terms] == ['lines_cleared', 'height_sum', 'holes', 'max_height']
@@ -0,0 +1,70 @@
+"""Caractéristiques tenues à jour incrémentalement, comparées à un recalcul complet"""
+import random
+
+from ai import TetrisAI, move_actions
+from board import landing_row, make_move
+from constants import PlayerType, STANDARD_SHAPES
+from engine import Action, TetrisEngine
+from features import BoardFeatures
+from shapes import SHAPE_REGISTRY
+
+def assert_matches_rebuild(features, rows):
+    """Les caractéristiques incrémentales valent celles recalculées depuis les masques"""
+    assert features.snapshot() == BoardFeatures(rows).snapshot()
+
+def random_move(rng, piece):
+    """Rotation et colonne quelconques où la pièce tient dans la largeur de la grille"""
+    rotation = rng.randrange(piece.shape.count)
+    column = rng.choice(piece.shape.rotations[rotation].positions)
+    return {'rotation': rotation, 'column': column}
+
+def test_engine_features_after_each_lock():
+    ai = TetrisAI(depth=1)
+    for seed in range(6):
+        engine = TetrisEngine(seed=seed, bag=seed % 2 == 1)
+        engine.start()
+        rng = random.Random(seed)
+        locks = 0
+        while not engine.game_over and locks < 300:
+            for player_type, player in engine.players.items():
+                # Coups de l'IA qui effacent des lignes, et coups au hasard qui créent trous et surplombs
+                if player_type == PlayerType.HUMAN and rng.random() < 0.15:
+                    move = random_move(rng, player.current_piece)
+                else:
+                    move = ai.choose_move(engine, player_type)
+                for action in move_actions(engine, player_type, move):
+                    engine.step(player_type, action)
+                result = engine.step(player_type, Action.DROP)
+                if engine.game_over:
+                    break
+                assert result['locked']
+                locks += 1
+
+                assert_matches_rebuild(player.features, player.board.rows)
+        assert all(player.lines > 0 for player in engine.players.values())
+
+def test_placement_matches_features_after_move(make_rows):
+    rng = random.Random(11)
+    for _ in range(200):
+        rows = make_rows(rng, rng.randrange(0, 16), rng.random() * 0.5)
+        features = BoardFeatures(rows)
+        piece_type = rng.choice(STANDARD_SHAPES)
+        for shape in SHAPE_REGISTRY[piece_type].rotations:
+            for column in shape.positions:
+                placed = features.placement(rows, shape, column)
+                if placed is None:
+                    assert landing_row(features.heights, shape, column) < 0
+                    continue
+
+                # Sans ligne complète, la pose décrite est exactement la grille après le coup
+                if placed['lines_cleared']:
+                    continue
+                after = list(rows)
+                make_move(after, shape, (placed['landing_row'], column))
+                expected = BoardFeatures(after)
+                assert placed['height_sum'] == expected.height_sum
+                assert placed['holes'] == expected.hole_count
+                assert placed['max_height'] == expected.max_height
+                assert placed['bumpiness'] == expected.bumpiness
+                assert placed['wells'] == expected.wells
+                assert placed['transitions'] == expected.transitions
@@ -0,0 +1,44 @@
+"""Chronomètres de l'instrumentation : percentiles estimés depuis l'histogramme"""
+import random
+
+import pytest
+
+from instrument import Profiler, Timer
+
+def timer_of(durations):
+    timer = Timer()
+    for ns in durations:
+        timer.add(ns)
+    return timer
+
+@pytest.mark.parametrize('seed', range(5))
+def test_percentiles_are_ordered_and_never_above_max(seed):
+    rng = random.Random(seed)
+    durations = [int(rng.lognormvariate(10, 2)) for _ in range(rng.randrange(1, 500))]
+    timer = timer_of(durations)
+    previous = 0
+    for fraction in (0.0, 0.1, 0.5, 0.9, 0.99, 1.0):
+        value = timer.percentile(fraction)
+        assert previous <= value <= max(durations) / 1000
+        previous = value
+
+def test_percentile_stays_within_its_bucket():
+    # 90 durées dans [1024, 2048[ ns et 10 dans [65536, 131072[ ns
+    timer = timer_of([1500] * 90 + [70000] * 10)
+    assert 1.024 <= timer.percentile(0.5) < 2.048
+    assert 65.536 <= timer.percentile(0.99) <= 70.0
+
+def test_single_call_reports_its_duration():
+    summary = timer_of([5000]).summary()
+    assert summary['calls'] == 1 and summary['max_us'] == 5.0
+    assert summary['p50_us'] <= 5.0 and summary['p99_us'] <= 5.0
+
+def test_report_starts_a_new_window():
+    profiler = Profiler(period=3600, output=None)
+    profiler.add_time('search', 2000)
+    profiler.count('search_nodes', 40)
+    profiler.count('search_nodes', 2)
+    report = profiler.report()
+    assert report['timers']['search']['calls'] == 1
+    assert report['counters'] == {'search_nodes': 42}
+    assert not profiler.report()['timers']
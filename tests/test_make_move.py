@@ -0,0 +1,58 @@
+"""Coups joués et annulés sur place par la recherche, comparés à la grille du jeu"""
+import random
+
+import pytest
+
+from board import FULL_ROW, Board, landing_row, make_move, unmake_move
+from constants import GRID_WIDTH, GRID_HEIGHT, STANDARD_SHAPES
+from features import BoardFeatures
+from shapes import SHAPE_REGISTRY
+
+@pytest.fixture
+def boards(make_rows):
+    """Grilles aléatoires, dont certaines ont des lignes presque pleines pour provoquer des effacements"""
+    rng = random.Random(7)
+    boards = []
+    for _ in range(300):
+        rows = make_rows(rng, rng.randrange(4, 16), rng.random() * 0.5)
+        for row in rng.sample(range(GRID_HEIGHT - 4, GRID_HEIGHT), rng.randrange(3)):
+            rows[row] = FULL_ROW ^ 1 << rng.randrange(GRID_WIDTH)
+        boards.append((rows, rng.choice(STANDARD_SHAPES)))
+    return boards
+
+def landings(rows, piece_type):
+    """Poses possibles (rotation, ligne d'arrivée, colonne) d'une pièce lâchée depuis le haut"""
+    heights = BoardFeatures(rows).heights
+    for shape in SHAPE_REGISTRY[piece_type].rotations:
+        for column in shape.positions:
+            row = landing_row(heights, shape, column)
+            if row >= 0:
+                yield shape, row, column
+
+def test_make_and_unmake_move_restore_rows_and_features(boards):
+    for rows, piece_type in boards:
+        features = BoardFeatures(rows)
+        before = (list(rows), features.snapshot())
+        for shape, row, column in landings(rows, piece_type):
+            snapshot = features.snapshot()
+            undo = make_move(rows, shape, (row, column), features)
+            assert features.snapshot() == BoardFeatures(rows).snapshot()
+
+            unmake_move(rows, undo)
+            features.restore(snapshot)
+            assert (rows, features.snapshot()) == before
+
+def test_make_move_matches_board_place_and_clear(boards):
+    for rows, piece_type in boards:
+        for shape, row, column in landings(rows, piece_type):
+            board = Board()
+            board.rows = list(rows)
+            board.cells = [[mask >> col & 1 for col in range(GRID_WIDTH)] for mask in rows]
+            board.place(shape, (row, column))
+            cleared = board.full_rows()
+            board.clear_rows(cleared)
+
+            after = list(rows)
+            undo = make_move(after, shape, (row, column))
+            assert after == board.rows and undo[2] == tuple(cleared)
+            assert board.rows == [sum(value << col for col, value in enumerate(cells)) for cells in board.cells]
@@ -0,0 +1,31 @@
+"""Recherche répartie sur des processus de calcul comparée à la recherche en série"""
+import random
+
+import pytest
+
+from constants import STANDARD_SHAPES
+from search import SearchEngine
+
+def test_parallel_search_matches_serial(make_rows):
+    rng = random.Random(1)
+    for depth, beam_width, positions in ((2, None, 12), (3, 4, 6)):
+        serial = SearchEngine(depth=depth, beam_width=beam_width)
+        parallel = SearchEngine(depth=depth, beam_width=beam_width, workers=2)
+        try:
+            for _ in range(positions):
+                rows = make_rows(rng, rng.randrange(0, 15), 0.3)
+                piece_types = tuple(rng.choice(STANDARD_SHAPES) for _ in range(depth))
+                expected = serial.best_move(rows, piece_types)
+                move = parallel.best_move(rows, piece_types)
+                # Les processus ont leurs propres tables : seul le coup choisi est comparé
+                assert (move['rotation'], move['column']) == (expected['rotation'], expected['column'])
+                assert move['depth'] == expected['depth'] == depth
+
+            # Le groupe de processus a bien servi (pas de retour silencieux à la recherche en série)
+            assert parallel.workers == 2 and parallel.pool is not None
+        finally:
+            parallel.close()
+
+def test_parallel_search_rejects_time_budget():
+    with pytest.raises(ValueError):
+        SearchEngine(workers=2, time_budget=50)
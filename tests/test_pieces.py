@@ -0,0 +1,45 @@
+"""Suites de pièces : sacs de 7, consultation à l'avance et reproductibilité"""
+import pytest
+
+from constants import PlayerType, STANDARD_SHAPES
+from engine import TetrisEngine
+from pieces import PieceSource
+
+def test_each_bag_holds_every_piece_once():
+    source = PieceSource(seed=4, bag=True)
+    pieces = [source.next() for _ in range(7 * 50)]
+    for start in range(0, len(pieces), 7):
+        assert sorted(pieces[start:start + 7]) == sorted(STANDARD_SHAPES)
+
+@pytest.mark.parametrize('bag', [False, True])
+def test_peek_does_not_consume(bag):
+    source = PieceSource(seed=9, bag=bag)
+    pieces = []
+    for count in (1, 5, 12, 3, 0, 20):
+        ahead = source.peek(count)
+        assert len(ahead) == count
+        assert source.peek(count) == ahead
+        pieces += [source.next() for _ in range(count)]
+        assert pieces[len(pieces) - count:] == ahead
+
+    # Consulter à l'avance ne décale pas la suite
+    reference = PieceSource(seed=9, bag=bag)
+    assert pieces == [reference.next() for _ in pieces]
+
+def test_special_draws_do_not_shift_the_standard_sequence():
+    source = PieceSource(seed=2)
+    reference = PieceSource(seed=2)
+    pieces = []
+    for _ in range(40):
+        source.choice(['I', 'O'])
+        pieces.append(source.next())
+    assert pieces == [reference.next() for _ in range(40)]
+
+def test_players_have_separate_reproducible_streams():
+    engine = TetrisEngine(seed=6, bag=True)
+    other = TetrisEngine(seed=6, bag=True)
+    human = engine.players[PlayerType.HUMAN].piece_source
+    ai = engine.players[PlayerType.AI].piece_source
+    assert human.peek(21) != ai.peek(21)
+    assert human.peek(21) == other.players[PlayerType.HUMAN].piece_source.peek(21)
+    assert ai.peek(21) == other.players[PlayerType.AI].piece_source.peek(21)
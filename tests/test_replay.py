@@ -0,0 +1,75 @@
+"""Enregistrement d'une partie puis rejeu sans interface"""
+import io
+
+import pytest
+
+from ai import TetrisAI
+from engine import TetrisEngine
+from replay import Replay, RecordingReader, RecordingWriter
+from scheduler import GameLoop
+from selfplay import play_game
+
+def engine_state(engine):
+    """Tout ce qui doit être identique entre la partie jouée et son rejeu"""
+    return (engine.game_over, engine.winner, engine.elapsed(), engine.slow_mode_active, engine.rainbow_mode_active,
+            [(player.board.rows, player.board.cells, player.board.hash, player.score, player.lines, player.pieces,
+              player.speed, player.position, player.rotation, player.current_piece.type, player.next_piece.type)
+             for player in engine.players.values()])
+
+def record_game(seed, bag, max_pieces):
+    """Joue une partie IA contre IA enregistrée en mémoire ; renvoie le moteur et l'enregistrement"""
+    engine = TetrisEngine(seed=seed, bag=bag)
+    stream = io.BytesIO()
+    recorder = RecordingWriter(stream, seed, bag)
+    loop = GameLoop(engine, TetrisAI(depth=1), ai_players=tuple(engine.players), recorder=recorder)
+    loop.start()
+    while not engine.game_over and all(player.pieces < max_pieces for player in engine.players.values()):
+        loop.tick()
+    recorder.close(loop.ticks)
+    return engine, stream.getvalue()
+
+def load(data, snapshot_interval=None):
+    reader = RecordingReader(io.BytesIO(data))
+    actions = list(reader)
+    return Replay(reader.seed, actions, reader.bag, reader.tick_ms, reader.ticks, snapshot_interval)
+
+@pytest.mark.parametrize('seed, bag', [(1, False), (2, True)])
+def test_replay_reproduces_recorded_game(seed, bag):
+    engine, data = record_game(seed, bag, max_pieces=60)
+    replay = load(data)
+    assert replay.seed == seed and replay.bag == bag
+    replay.play()
+    assert engine_state(replay.engine) == engine_state(engine)
+
+def test_seek_matches_linear_replay():
+    _, data = record_game(3, False, max_pieces=40)
+    replay = load(data, snapshot_interval=50)
+    count = len(replay.actions)
+    for move in (count // 2, 0, count, 49, 50, 51, count // 3, count - 1):
+        replay.seek(move)
+        linear = load(data)
+        linear.play(move)
+        assert (replay.ticks, replay.move) == (linear.ticks, linear.move)
+        assert engine_state(replay.engine) == engine_state(linear.engine)
+    assert replay.snapshots
+
+def test_truncated_recording_reads_complete_actions():
+    _, data = record_game(4, False, max_pieces=10)
+    full = RecordingReader(io.BytesIO(data))
+    actions = list(full)
+    assert full.ticks is not None
+
+    truncated = RecordingReader(io.BytesIO(data[:-5]))
+    prefix = list(truncated)
+    assert truncated.ticks is None
+    assert prefix == actions[:len(prefix)] and len(prefix) >= len(actions) - 3
+
+def test_selfplay_recording_replays_to_same_result(tmp_path):
+    path = str(tmp_path / '5.ttr')
+    result = play_game(5, max_pieces=40, ai=TetrisAI(depth=1), record=path)
+    replay = Replay.load(path)
+    replay.play()
+    summary = replay.summary()
+    assert (summary['winner'], summary['survival_time']) == (result['winner'], result['survival_time'])
+    for name in ('human', 'ai'):
+        assert summary[name] == result[name]
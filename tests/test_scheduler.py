@@ -0,0 +1,46 @@
+"""Boucle de jeu à pas fixe : une même graine et les mêmes entrées donnent la même partie"""
+import random
+
+from ai import TetrisAI
+from constants import PlayerType
+from engine import Action, TetrisEngine
+from scheduler import GameLoop
+
+def run_game(seed, ticks, inputs_seed=None):
+    """Joue `ticks` pas ; avec `inputs_seed`, le joueur humain reçoit des entrées tirées au hasard"""
+    engine = TetrisEngine(seed=seed)
+    ai_players = (PlayerType.AI,) if inputs_seed is not None else tuple(engine.players)
+    loop = GameLoop(engine, TetrisAI(depth=1), ai_players=ai_players)
+    rng = random.Random(inputs_seed)
+    log = []
+    loop.start()
+    for _ in range(ticks):
+        if inputs_seed is not None and rng.random() < 0.05:
+            loop.queue(PlayerType.HUMAN, rng.choice(list(Action)))
+        for player_type, result in loop.tick():
+            log.append((loop.ticks, player_type, result['moved'], result['locked'], result['lines_cleared']))
+        if engine.game_over:
+            break
+
+    state = [(player.board.rows, player.score, player.lines, player.pieces, player.position, player.rotation,
+              player.current_piece.type) for player in engine.players.values()]
+    return log, state, loop.ticks, engine.elapsed(), engine.game_over
+
+def test_ai_game_is_identical_across_runs():
+    first = run_game(3, 4000)
+    assert first[0] and first[1][1][2] > 0
+    assert run_game(3, 4000) == first
+    assert run_game(4, 4000) != first
+
+def test_queued_inputs_are_replayed_identically():
+    first = run_game(5, 3000, inputs_seed=1)
+    assert any(player_type == PlayerType.HUMAN for _, player_type, *_ in first[0])
+    assert run_game(5, 3000, inputs_seed=1) == first
+
+def test_elapsed_time_follows_ticks():
+    engine = TetrisEngine(seed=0)
+    loop = GameLoop(engine, TetrisAI(depth=1), ai_players=tuple(engine.players))
+    loop.start()
+    for _ in range(250):
+        loop.tick()
+    assert engine.elapsed() == loop.ticks * loop.tick_ms / 1000
@@ -0,0 +1,37 @@
+"""Recherche à temps limité : échéance respectée, approfondissement itératif et coup de repli"""
+import random
+
+from board import FULL_ROW
+from constants import GRID_WIDTH, GRID_HEIGHT, STANDARD_SHAPES
+from search import SearchEngine
+
+# Marge (ms) laissée au-delà de l'échéance : le niveau en cours n'est interrompu qu'entre deux nœuds
+MARGIN_MS = 30
+
+def test_deadline_is_honoured(make_rows):
+    rng = random.Random(2)
+    engine = SearchEngine(depth=4, time_budget=20)
+    for _ in range(5):
+        rows = make_rows(rng, rng.randrange(0, 12), 0.3)
+        move = engine.best_move(rows, (rng.choice(STANDARD_SHAPES),))
+        assert engine.timed_out and 1 <= move['depth'] < 4
+        assert engine.elapsed_ms < engine.time_budget + MARGIN_MS
+
+def test_large_budget_matches_full_search(make_rows):
+    rng = random.Random(5)
+    full = SearchEngine(depth=2)
+    anytime = SearchEngine(depth=2, time_budget=60000)
+    for _ in range(10):
+        rows = make_rows(rng, rng.randrange(0, 12), 0.3)
+        piece_types = tuple(rng.choice(STANDARD_SHAPES) for _ in range(2))
+        expected = full.best_move(rows, piece_types)
+        move = anytime.best_move(rows, piece_types)
+        assert not anytime.timed_out
+        assert (move['rotation'], move['column'], move['depth']) == (expected['rotation'], expected['column'], 2)
+
+def test_fallback_move_when_nothing_fits():
+    # Chaque ligne a un seul trou, dans des colonnes qui ne se suivent pas : aucune pièce ne rentre
+    rows = [FULL_ROW ^ 1 << (row * 3 % GRID_WIDTH) for row in range(GRID_HEIGHT)]
+    for time_budget in (None, 20):
+        move = SearchEngine(depth=2, time_budget=time_budget).best_move(rows, ('T', 'I'))
+        assert (move['rotation'], move['column']) == (0, GRID_WIDTH // 2 - 1)
@@ -0,0 +1,44 @@
+"""Réglage des poids : une reprise depuis le fichier d'état donne le même résultat qu'un réglage d'un seul tenant"""
+import json
+
+import pytest
+
+import tune
+
+def run(tmp_path, name, generations):
+    """Lance tune.py sur quelques parties très courtes ; renvoie l'état enregistré et le profil écrit"""
+    checkpoint = str(tmp_path / f"{name}.json")
+    output = str(tmp_path / f"{name}_poids.json")
+    tune.main(['--generations', str(generations), '--population', '3', '--games', '1', '--validation-games', '1',
+               '--max-pieces', '15', '--depth', '1', '--workers', '2', '--seed', '7',
+               '--checkpoint', checkpoint, '--output', output])
+    with open(checkpoint) as f:
+        state = json.load(f)
+    with open(output) as f:
+        profile = json.load(f)
+    for summary in state['history']:
+        del summary['wall_time']
+    return state, profile
+
+def test_resume_matches_uninterrupted_run(tmp_path, capsys, monkeypatch):
+    state, profile = run(tmp_path, 'continu', 3)
+    assert state['generation'] == 3 and len(state['history']) == 3
+    # Chaque génération est validée avec la suivante, la dernière seule à la fin
+    assert [summary['validation']['generation'] for summary in state['history'][1:]] == [0, 1]
+    assert state['pending'] is None and state['best']['generation'] in (0, 1, 2)
+
+    # Interruption au début de la génération 2, le meilleur candidat de la 1 restant à valider
+    run_generation = tune.run_generation
+    def interrupted(pool, state, args, floor):
+        if state['generation'] == 2:
+            raise KeyboardInterrupt
+        return run_generation(pool, state, args, floor)
+    monkeypatch.setattr(tune, 'run_generation', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, 'repris', 3)
+    monkeypatch.setattr(tune, 'run_generation', run_generation)
+
+    resumed_state, resumed_profile = run(tmp_path, 'repris', 3)
+    assert resumed_state == state
+    assert resumed_profile == profile
+    assert 'Reprise à la génération 2' in capsys.readouterr().err
@@ -0,0 +1,50 @@
+"""Hachage de Zobrist tenu à jour incrémentalement, comparé à un recalcul complet"""
+import random
+
+from ai import TetrisAI
+from board import FULL_ROW, ZOBRIST, board_hash, landing_row, make_move, unmake_move
+from constants import GRID_WIDTH, GRID_HEIGHT, STANDARD_SHAPES
+from engine import TetrisEngine
+from features import BoardFeatures
+from shapes import SHAPE_REGISTRY
+
+def test_cell_keys_are_distinct():
+    keys = [ZOBRIST[row][1 << col] for row in range(GRID_HEIGHT) for col in range(GRID_WIDTH)]
+    assert len(set(keys)) == len(keys) and 0 not in keys
+    assert board_hash([0] * GRID_HEIGHT) == 0
+
+def test_engine_hash_after_each_lock():
+    ai = TetrisAI(depth=1)
+    for seed in range(4):
+        engine = TetrisEngine(seed=seed, bag=seed % 2 == 1)
+        engine.start()
+        locks = 0
+        while not engine.game_over and locks < 200:
+            for player_type, player in engine.players.items():
+                result = ai.play_turn(engine, player_type)
+                if engine.game_over:
+                    break
+                assert result['locked']
+                locks += 1
+                assert player.board.hash == board_hash(player.board.rows)
+        assert all(player.lines > 0 for player in engine.players.values())
+
+def test_make_move_updates_hash(make_rows):
+    rng = random.Random(8)
+    for _ in range(200):
+        rows = make_rows(rng, rng.randrange(4, 16), rng.random() * 0.5)
+        # Quelques lignes presque pleines pour provoquer des effacements
+        for row in rng.sample(range(GRID_HEIGHT - 4, GRID_HEIGHT), rng.randrange(3)):
+            rows[row] = FULL_ROW ^ 1 << rng.randrange(GRID_WIDTH)
+
+        heights = BoardFeatures(rows).heights
+        zhash = board_hash(rows)
+        for shape in SHAPE_REGISTRY[rng.choice(STANDARD_SHAPES)].rotations:
+            for column in shape.positions:
+                row = landing_row(heights, shape, column)
+                if row < 0:
+                    continue
+                undo = make_move(rows, shape, (row, column), None, zhash)
+                assert undo[-1] == board_hash(rows)
+                unmake_move(rows, undo)
+                assert board_hash(rows) == zhash
@@ -0,0 +1,205 @@
+"""Réglage des poids de l'évaluateur par la méthode de l'entropie croisée.
+
+Exemple : python tune.py --generations 100 --population 64 --games 8 --workers 64 --output poids.json
+
+À chaque génération, une population de vecteurs de poids est tirée autour
+de la moyenne courante ; chaque vecteur joue les mêmes parties IA contre IA
+(mêmes graines, sans interface), réparties sur un groupe de processus. Les
+meilleurs (l'élite) donnent la moyenne et l'écart type de la génération
+suivante. L'état est enregistré après chaque génération dans un fichier de
+reprise : relancer la même commande reprend là où le réglage s'était
+arrêté. Les parties changent à chaque génération : le meilleur candidat
+d'une génération est donc rejoué sur un jeu fixe de parties de validation,
+et seul ce score, comparable d'une génération à l'autre, désigne le meilleur
+vecteur trouvé. Pour ne pas laisser de processus inoccupés, la validation
+d'une génération est jouée avec les parties de la génération suivante (la
+dernière est validée seule à la fin). Le meilleur vecteur validé est écrit
+comme profil chargeable avec --weights (main.py, selfplay.py).
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+
+from ai import TetrisAI
+from constants import AI_DEPTH
+from evaluator import FEATURES, Evaluator
+from selfplay import play_game
+
+# Décalage des graines de validation, hors de celles des générations
+VALIDATION_SEED_OFFSET = 1 << 40
+
+def fitness(result):
+    """Lignes effacées par joueur dans une partie (les deux joueurs utilisent les poids testés)"""
+    players = [result[name] for name in ('human', 'ai')]
+    return sum(player['lines'] for player in players) / len(players)
+
+def _play(task):
+    """Point d'entrée des processus de calcul : une partie d'un candidat"""
+    index, vector, seed, max_pieces, bag, depth = task
+    ai = TetrisAI(depth=depth, evaluator=Evaluator.from_vector(vector))
+    return index, fitness(play_game(seed, max_pieces, bag, ai))
+
+def initial_state(sigma):
+    """Départ du réglage : poids par défaut, écart type proportionnel à chaque poids"""
+    mean = Evaluator().vector()
+    return {
+        'generation': 0,
+        'mean': mean,
+        'std': [max(abs(weight), 1.0) * sigma for weight in mean],
+        'best': None,
+        # Meilleur candidat de la dernière génération, en attente de validation
+        'pending': None,
+        'history': [],
+    }
+
+def load_checkpoint(path):
+    """État enregistré après la dernière génération terminée, ou None"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, state):
+    """Enregistre l'état ; le fichier est remplacé d'un coup pour survivre à une interruption"""
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temporary, path)
+
+def sample(state, population, seed):
+    """Population de la génération suivante, tirée autour de la moyenne courante"""
+    rng = random.Random(f"{seed}/{state['generation']}")
+    candidates = [list(state['mean'])]  # La moyenne elle-même fait partie de la population
+    while len(candidates) < population:
+        candidates.append([rng.gauss(mean, std) for mean, std in zip(state['mean'], state['std'])])
+    return candidates
+
+def validation_seeds(args):
+    """Graines des parties de validation, les mêmes à chaque génération"""
+    return [VALIDATION_SEED_OFFSET + args.seed + game for game in range(args.validation_games)]
+
+def play_candidates(pool, games, args):
+    """Score moyen de chaque vecteur de poids sur ses parties.
+
+    `games` est une liste de couples (vecteur, graines) : toutes les parties
+    sont envoyées au groupe de processus en une seule fois.
+    """
+    tasks = [(index, vector, seed, args.max_pieces, args.bag, args.depth)
+             for index, (vector, seeds) in enumerate(games) for seed in seeds]
+
+    # Petits lots : les parties sont longues et de durées inégales
+    scores = [[] for _ in games]
+    for index, score in pool.imap_unordered(_play, tasks, chunksize=1):
+        scores[index].append(score)
+    return [statistics.mean(candidate_scores) for candidate_scores in scores]
+
+def record_validation(state, fitness):
+    """Enregistre le score de validation du candidat en attente et renvoie son résumé"""
+    pending, state['pending'] = state['pending'], None
+    if state['best'] is None or fitness > state['best']['fitness']:
+        state['best'] = {'fitness': fitness, 'generation': pending['generation'], 'vector': pending['vector']}
+    return {'generation': pending['generation'], 'fitness': fitness}
+
+def run_generation(pool, state, args, floor):
+    """Joue une génération, met à jour l'état et renvoie son résumé"""
+    started = time.perf_counter()
+    generation = state['generation']
+    candidates = sample(state, args.population, args.seed)
+
+    # Mêmes graines pour tous les candidats d'une génération, nouvelles à chaque génération
+    seeds = [args.seed + generation * args.games + game for game in range(args.games)]
+    games = [(vector, seeds) for vector in candidates]
+
+    # Validation du meilleur candidat de la génération précédente, dans le même envoi
+    pending = state.get('pending')
+    if pending:
+        games.append((pending['vector'], validation_seeds(args)))
+    scores = play_candidates(pool, games, args)
+    fitnesses = scores[:len(candidates)]
+    validation = record_validation(state, scores[-1]) if pending else None
+
+    # Élite : moyenne et écart type de la génération suivante, avec un écart type minimal
+    ranking = sorted(range(len(candidates)), key=lambda index: fitnesses[index], reverse=True)
+    elite = [candidates[index] for index in ranking[:max(2, int(len(candidates) * args.elite))]]
+    columns = list(zip(*elite))
+    state['mean'] = [statistics.mean(column) for column in columns]
+    state['std'] = [max(statistics.pstdev(column), minimum) for column, minimum in zip(columns, floor)]
+
+    # Meilleur candidat validé avec la génération suivante
+    best = ranking[0]
+    state['pending'] = {'generation': generation, 'vector': candidates[best]}
+
+    summary = {
+        'generation': generation,
+        'best_fitness': fitnesses[best],
+        'validation': validation,
+        'mean_fitness': statistics.mean(fitnesses),
+        'elite_fitness': statistics.mean(fitnesses[index] for index in ranking[:len(elite)]),
+        'mean': dict(zip(FEATURES, state['mean'])),
+        'wall_time': time.perf_counter() - started,
+    }
+    state['history'].append(summary)
+    state['generation'] = generation + 1
+    return summary
+
+def save_state(args, state, summary, output):
+    """Enregistre l'état et le meilleur profil validé, puis écrit le résumé"""
+    save_checkpoint(args.checkpoint, state)
+    if state['best']:
+        Evaluator.from_vector(state['best']['vector']).save(
+            args.output, fitness=state['best']['fitness'], generation=state['best']['generation'])
+    output.write(json.dumps(summary) + '\n')
+    output.flush()
+
+def tune(args, output=sys.stdout):
+    """Boucle des générations, reprise depuis le fichier d'état s'il existe"""
+    state = load_checkpoint(args.checkpoint)
+    if state is None:
+        state = initial_state(args.sigma)
+    else:
+        sys.stderr.write(f"Reprise à la génération {state['generation']}\n")
+
+    # Écart type minimal, relatif à chaque poids de départ
+    floor = [max(abs(weight), 1.0) * args.min_sigma for weight in Evaluator().vector()]
+
+    with Pool(args.workers or os.cpu_count()) as pool:
+        while state['generation'] < args.generations:
+            summary = run_generation(pool, state, args, floor)
+            save_state(args, state, summary, output)
+
+        # Validation de la dernière génération, seule
+        if state.get('pending'):
+            fitness = play_candidates(pool, [(state['pending']['vector'], validation_seeds(args))], args)[0]
+            save_state(args, state, {'validation': record_validation(state, fitness)}, output)
+        pool.close()
+        pool.join()
+    return state
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Réglage des poids de l'évaluateur sur des parties sans interface")
+    parser.add_argument('--generations', type=int, default=50, help="nombre total de générations")
+    parser.add_argument('--population', type=int, default=40, help="candidats par génération")
+    parser.add_argument('--elite', type=float, default=0.25, help="part des meilleurs candidats gardée")
+    parser.add_argument('--games', type=int, default=4, help="parties jouées par candidat")
+    parser.add_argument('--validation-games', type=int, default=8,
+                        help="parties de validation (fixes) jouées par le meilleur candidat de chaque génération")
+    parser.add_argument('--max-pieces', type=int, default=300, help="arrêter une partie quand un joueur a posé autant de pièces")
+    parser.add_argument('--depth', type=int, default=AI_DEPTH,
+                        help="profondeur de recherche de l'IA (celle du jeu par défaut)")
+    parser.add_argument('--bag', action='store_true', help="distribuer les pièces par sacs de 7")
+    parser.add_argument('--sigma', type=float, default=0.5, help="écart type de départ, relatif à chaque poids")
+    parser.add_argument('--min-sigma', type=float, default=0.05, help="écart type minimal, relatif à chaque poids")
+    parser.add_argument('--seed', type=int, default=0, help="graine des tirages et des parties")
+    parser.add_argument('--workers', type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument('--checkpoint', default='tune_state.json', help="fichier d'état pour reprendre le réglage")
+    parser.add_argument('--output', default='weights.json', help="profil des meilleurs poids trouvés")
+    args = parser.parse_args(argv)
+    tune(args)
+
+if __name__ == "__main__":
+    main()